@@ -0,0 +1,276 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# Throughput benchmarks for monte_carlo.py. Each case runs in a fresh process,
+# so peak RSS belongs to that case alone, and the best of several repeats is
+# reported. Every case runs on both engines, so the numpy engine can be
+# compared with the original python loop that the article runs. Results are
+# written as JSON so runs on different commits can be compared directly.
+#
+#   python benchmark_monte_carlo.py
+#   python benchmark_monte_carlo.py --paths 1000 10000 --months 12 120
+#   python benchmark_monte_carlo.py --engines numpy --paths 100000
+#   python benchmark_monte_carlo.py --only run_withdrawal_monte_carlo --output withdrawal.json
+
+ARTICLE_DIR = Path(__file__).resolve().parent
+DEFAULT_PATHS = (1_000, 10_000, 100_000)
+DEFAULT_MONTHS = (12, 120, 480)
+DEFAULT_OUTPUT = Path("benchmark_results.json")
+ENGINES = ("python", "numpy")
+BENCHMARKS = (
+    "run_monte_carlo_simulation",
+    "run_withdrawal_monte_carlo",
+    "calculate_cumulative_breach_probabilities",
+    "summarise_withdrawal_results",
+    "main",
+)
+
+
+def benchmark_rng(engine: str) -> random.Random | np.random.Generator:
+    if engine == "python":
+        return random.Random(7)
+
+    return np.random.default_rng(7)
+
+
+def benchmark_case(
+    name: str,
+    engine: str,
+    paths: int,
+    months: int,
+    repeat: int,
+) -> dict:
+    # Runs inside a worker process. Setup is kept out of the timed section.
+    sys.path.insert(0, str(ARTICLE_DIR))
+    import monte_carlo
+
+    asset = monte_carlo.Asset("Balanced", 0.065, 0.10)
+    scenario = monte_carlo.WithdrawalScenario(
+        starting_value=100_000,
+        annual_withdrawal=8_000,
+        months=months,
+        reserve_floor=40_000,
+    )
+
+    def simulate():
+        monte_carlo.run_monte_carlo_simulation(
+            asset=asset,
+            months=months,
+            starting_value=10_000,
+            simulations=paths,
+            engine=engine,
+            rng=benchmark_rng(engine),
+        )
+
+    def withdraw():
+        return monte_carlo.run_withdrawal_monte_carlo(
+            asset=asset,
+            scenario=scenario,
+            simulations=paths,
+            engine=engine,
+            rng=benchmark_rng(engine),
+        )
+
+    if name == "run_monte_carlo_simulation":
+        run = simulate
+    elif name == "run_withdrawal_monte_carlo":
+        run = withdraw
+    elif name == "calculate_cumulative_breach_probabilities":
+        results = withdraw()
+
+        def run():
+            monte_carlo.calculate_cumulative_breach_probabilities(results, scenario)
+
+    elif name == "summarise_withdrawal_results":
+        results = withdraw()
+
+        def run():
+            monte_carlo.summarise_withdrawal_results(results)
+
+    elif name == "main":
+        return benchmark_main(monte_carlo, engine, repeat)
+    else:
+        raise ValueError(f"Unknown benchmark {name!r}.")
+
+    seconds = best_time(run, repeat)
+
+    return {
+        "benchmark": name,
+        "engine": engine,
+        "paths": paths,
+        "months": months,
+        "seconds": seconds,
+        "paths_per_second": paths / seconds if seconds else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def benchmark_main(monte_carlo, engine: str, repeat: int) -> dict:
+    # main() writes its charts and cache relative to the working directory, so
+    # each repeat runs in an empty directory with only the logo, which also
+    # keeps the simulation cache cold.
+    import matplotlib.pyplot as plt
+
+    timings = []
+
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            shutil.copy(ARTICLE_DIR / "logo.png", directory)
+            previous_directory = os.getcwd()
+            os.chdir(directory)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    monte_carlo.main(engine)
+                    timings.append(time.perf_counter() - start)
+            finally:
+                plt.close("all")
+                os.chdir(previous_directory)
+
+    return {
+        "benchmark": "main",
+        "engine": engine,
+        "paths": None,
+        "months": None,
+        "seconds": min(timings),
+        "paths_per_second": None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def best_time(run, repeat: int) -> float:
+    timings = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def peak_rss_mb() -> float | None:
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    if sys.platform == "darwin":
+        return peak / 2**20
+
+    return peak / 2**10
+
+
+def run_isolated(
+    name: str,
+    engine: str,
+    paths: int | None,
+    months: int | None,
+    repeat: int,
+) -> dict:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+        return executor.submit(
+            benchmark_case,
+            name,
+            engine,
+            paths,
+            months,
+            repeat,
+        ).result()
+
+
+def build_cases(benchmarks, engines, paths_options, months_options) -> list[tuple]:
+    cases = []
+
+    for name in benchmarks:
+        for engine in engines:
+            if name == "main":
+                cases.append((name, engine, None, None))
+                continue
+
+            for paths in paths_options:
+                for months in months_options:
+                    cases.append((name, engine, paths, months))
+
+    return cases
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ARTICLE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark monte_carlo.py.")
+    parser.add_argument("--paths", type=int, nargs="+", default=list(DEFAULT_PATHS))
+    parser.add_argument("--months", type=int, nargs="+", default=list(DEFAULT_MONTHS))
+    parser.add_argument("--only", choices=BENCHMARKS, nargs="+", default=list(BENCHMARKS))
+    parser.add_argument("--engines", choices=ENGINES, nargs="+", default=list(ENGINES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    cases = build_cases(args.only, args.engines, args.paths, args.months)
+    results = []
+
+    for name, engine, paths, months in cases:
+        result = run_isolated(name, engine, paths, months, args.repeat)
+        results.append(result)
+
+        size = "full pipeline" if paths is None else f"{paths:,} paths x {months} months"
+        throughput = ""
+        if result["paths_per_second"] is not None:
+            throughput = f", {result['paths_per_second']:,.0f} paths/s"
+        peak = ""
+        if result["peak_rss_mb"] is not None:
+            peak = f", peak RSS {result['peak_rss_mb']:,.0f} MB"
+        print(f"{name} ({engine}), {size}: {result['seconds']:.3f}s{throughput}{peak}")
+
+    report = {
+        "commit": current_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print(f"\nSaved benchmark results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,17 @@
+import hashlib
+import inspect
+import json
+import os
+from functools import lru_cache, wraps
+from pathlib import Path
+
+import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.image as mpimg
 from cycler import cycler
+import numpy as np
+from matplotlib.colors import LinearSegmentedColormap, PowerNorm, to_rgba
+from matplotlib.figure import Figure
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 from matplotlib.ticker import FuncFormatter
 
@@ -17,6 +28,16 @@ COLORS = {
 
 DEFAULT_LOGO_PATH = "logo.png"
 
+# Written next to the saved charts, recording what each file was rendered from.
+CHART_MANIFEST_NAME = "chart_manifest.json"
+
+# Bump when a chart function's drawing code changes, so existing files are
+# rendered again.
+RENDER_CACHE_VERSION = 1
+
+# rcParams that do not affect the saved file.
+RENDER_CACHE_IGNORED_RC_PARAMS = ("backend", "backend_fallback", "interactive")
+
 NOTE_STYLE = {
     "color": COLORS["muted_fg"],
     "fontsize": 10,
@@ -68,8 +89,42 @@ def inset_numeric_x_label_position(x_values, inset_share=0.10):
     return x_values[-1] - (x_values[-1] - x_values[0]) * inset_share
 
 
+def load_logo_image(logo_path=DEFAULT_LOGO_PATH):
+    # The file's modification time is part of the cache key, so an edited logo
+    # is decoded again and unchanged logos are read once per process.
+    path = os.path.abspath(logo_path)
+    return decode_logo_image(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=16)
+def decode_logo_image(path, modified_time):
+    # Grayscale, grayscale with alpha, RGB and RGBA files all come back as
+    # float RGBA, so every logo is drawn the same way. Alpha and zoom are left
+    # to OffsetImage. The array is shared between charts, so it is read-only.
+    image = mpimg.imread(path)
+
+    if image.dtype == np.uint8:
+        image = image.astype(np.float32) / 255
+
+    if image.ndim == 2:
+        image = image[..., np.newaxis]
+
+    if image.shape[-1] in (1, 2):
+        image = np.concatenate(
+            [np.repeat(image[..., :1], 3, axis=-1), image[..., 1:]],
+            axis=-1,
+        )
+
+    if image.shape[-1] == 3:
+        image = np.dstack([image, np.ones(image.shape[:2], dtype=image.dtype)])
+
+    image = np.ascontiguousarray(image)
+    image.setflags(write=False)
+    return image
+
+
 def add_logo_watermark(ax, logo_path=DEFAULT_LOGO_PATH, zoom=0.6, alpha=0.12):
-    image = mpimg.imread(logo_path)
+    image = load_logo_image(logo_path)
     imagebox = OffsetImage(image, zoom=zoom, alpha=alpha)
 
     ab = AnnotationBbox(
@@ -84,6 +139,181 @@ def add_logo_watermark(ax, logo_path=DEFAULT_LOGO_PATH, zoom=0.6, alpha=0.12):
     ax.add_artist(ab)
 
 
+def plot_path_density(ax, density, color=COLORS["accent"], zorder=3):
+    # density["counts"] has one row per value bin and one column per month.
+    # Each month is converted to shares of its paths. The colour scale tops
+    # out at the 99th percentile share, so the first month (every path in one
+    # bin) and depleted paths piling up at zero do not wash out the rest. The
+    # mesh fades from transparent to the accent colour, leaving grid and
+    # reference lines visible underneath.
+    counts = density["counts"].astype(np.float64)
+    totals = counts.sum(axis=0, keepdims=True)
+    shares = np.divide(counts, totals, out=np.zeros_like(counts), where=totals > 0)
+    visible_shares = shares[shares > 0]
+    share_max = np.percentile(visible_shares, 99) if visible_shares.size else 1
+    month_edges = np.arange(counts.shape[1] + 1) - 0.5
+    colormap = LinearSegmentedColormap.from_list(
+        "density",
+        [to_rgba(color, 0), to_rgba(color, 0.9)],
+    )
+
+    return ax.pcolormesh(
+        month_edges,
+        density["value_edges"],
+        np.ma.masked_equal(shares, 0),
+        cmap=colormap,
+        norm=PowerNorm(gamma=0.6, vmin=0, vmax=share_max, clip=True),
+        shading="flat",
+        rasterized=True,
+        zorder=zorder,
+    )
+
+
+def file_sha256(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def normalise_render_input(value):
+    if isinstance(value, np.ndarray):
+        return {
+            "shape": list(value.shape),
+            "dtype": str(value.dtype),
+            "sha256": hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest(),
+        }
+
+    if isinstance(value, dict):
+        return {str(key): normalise_render_input(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [normalise_render_input(item) for item in value]
+
+    if isinstance(value, np.generic):
+        return value.item()
+
+    if isinstance(value, Path):
+        return str(value)
+
+    if hasattr(value, "to_numpy"):
+        return normalise_render_input(value.to_numpy())
+
+    return value
+
+
+@lru_cache(maxsize=1)
+def chart_code_sha256():
+    # The chart functions and every helper they call live in this module, so
+    # any edit to the drawing code changes the source hash.
+    return file_sha256(__file__)
+
+
+def build_render_key(chart_name, arguments):
+    # Covers the chart inputs, the drawing code, the colour palette, the
+    # active style and the logo contents. Values without a stable form (such
+    # as a formatter function) fall back to repr, which includes their
+    # address, so those charts are simply always drawn.
+    rc_params = {
+        key: value
+        for key, value in plt.rcParams.items()
+        if key not in RENDER_CACHE_IGNORED_RC_PARAMS
+    }
+    watermark_path = arguments.get("watermark_path")
+    watermark = None
+    if arguments.get("watermark") and watermark_path and os.path.exists(watermark_path):
+        watermark = file_sha256(watermark_path)
+
+    payload = json.dumps(
+        {
+            "version": RENDER_CACHE_VERSION,
+            "matplotlib": matplotlib.__version__,
+            "chart": chart_name,
+            "chart_code": chart_code_sha256(),
+            "colors": COLORS,
+            "arguments": normalise_render_input(arguments),
+            "rc_params": normalise_render_input(rc_params),
+            "watermark": watermark,
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_chart_manifest(manifest_path):
+    try:
+        with open(manifest_path, encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+
+def record_chart_render(save_path, key):
+    # Charts may be saved from several worker processes at once. Each entry
+    # stores the file's own hash too, so an entry overwritten by a concurrent
+    # writer can only cause a re-render, never a stale chart being kept.
+    save_path = Path(save_path)
+    manifest_path = save_path.parent / CHART_MANIFEST_NAME
+    manifest = load_chart_manifest(manifest_path)
+    manifest[save_path.name] = {"key": key, "sha256": file_sha256(save_path)}
+
+    temporary_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(temporary_path, manifest_path)
+
+
+def chart_render_is_current(save_path, key):
+    save_path = Path(save_path)
+    entry = load_chart_manifest(save_path.parent / CHART_MANIFEST_NAME).get(save_path.name)
+
+    return (
+        entry is not None
+        and entry.get("key") == key
+        and save_path.exists()
+        and entry.get("sha256") == file_sha256(save_path)
+    )
+
+
+def cached_render(chart):
+    # Contract for every decorated chart: when save_path is given and the
+    # manifest shows the file was already rendered from the same inputs, code
+    # and style, the chart is not drawn again and the call returns None
+    # instead of a Figure. Charts asked to show themselves are always drawn.
+    signature = inspect.signature(chart)
+
+    @wraps(chart)
+    def render(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        save_path = arguments.pop("save_path")
+        show = arguments.pop("show")
+
+        if save_path is None:
+            return chart(*args, **kwargs)
+
+        key = build_render_key(chart.__name__, arguments)
+        if not show and chart_render_is_current(save_path, key):
+            return None
+
+        fig = chart(*args, **kwargs)
+        record_chart_render(save_path, key)
+        return fig
+
+    return render
+
+
+def create_figure(show=False, **subplot_kwargs):
+    # Charts draw on a Figure that pyplot does not track, so they can be
+    # rendered in worker processes and are freed once the caller drops them.
+    # Each chart function returns its Figure, which notebooks display inline.
+    # show=True is for interactive use: the Figure comes from pyplot so that
+    # plt.show() can open it in a window.
+    fig = plt.figure() if show else Figure()
+    axes = fig.subplots(**subplot_kwargs)
+    return fig, axes
+
+
 def setup_matplotlib_style():
     plt.rcParams["figure.figsize"] = (12, 7)
     plt.rcParams["figure.dpi"] = 100
@@ -135,8 +365,9 @@ def simulated_paths_chart(
     watermark=True,
     watermark_path=DEFAULT_LOGO_PATH,
     save_path=None,
+    show=False,
 ):
-    fig, ax = plt.subplots()
+    fig, ax = create_figure(show=show)
 
     style_axes(
         fig,
@@ -194,14 +425,18 @@ def simulated_paths_chart(
     apply_month_ticks(ax, x[-1])
     apply_compact_currency_axis(ax)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
+
+    if show:
+        plt.show()
 
-    plt.show()
+    return fig
 
 
+@cached_render
 def horizon_loss_chart(
     categories,
     values,
@@ -212,8 +447,9 @@ def horizon_loss_chart(
     watermark=True,
     watermark_path=DEFAULT_LOGO_PATH,
     save_path=None,
+    show=False,
 ):
-    fig, ax = plt.subplots()
+    fig, ax = create_figure(show=show)
 
     style_axes(
         fig,
@@ -250,14 +486,18 @@ def horizon_loss_chart(
     ax.set_ylabel(ylabel)
     apply_whole_percent_axis(ax)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
 
-    plt.show()
+    if show:
+        plt.show()
 
+    return fig
 
+
+@cached_render
 def horizon_range_chart(
     categories,
     p5_values,
@@ -271,8 +511,9 @@ def horizon_range_chart(
     watermark=True,
     watermark_path=DEFAULT_LOGO_PATH,
     save_path=None,
+    show=False,
 ):
-    fig, ax = plt.subplots()
+    fig, ax = create_figure(show=show)
 
     style_axes(
         fig,
@@ -347,12 +588,15 @@ def horizon_range_chart(
         fontsize=10,
     )
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
+
+    if show:
+        plt.show()
 
-    plt.show()
+    return fig
 
 
 def style_axes(
@@ -370,7 +614,10 @@ def style_axes(
         spine.set_color(COLORS["border"])
 
     ax.tick_params(colors=COLORS["fg"], labelsize=10)
-    ax.grid(grid, axis="y", linestyle="--", linewidth=0.8, alpha=0.25, color=COLORS["border"])
+    if grid:
+        ax.grid(True, axis="y", linestyle="--", linewidth=0.8, alpha=0.25, color=COLORS["border"])
+    else:
+        ax.grid(False)
 
     if zero_line:
         ax.axhline(0, color=COLORS["fg"], linewidth=1.2, alpha=0.9, zorder=2)
@@ -379,6 +626,7 @@ def style_axes(
         add_logo_watermark(ax, logo_path=watermark_path)
 
 
+@cached_render
 def line_chart(
     x,
     y,
@@ -393,8 +641,9 @@ def line_chart(
     reference_line=None,
     reference_label=None,
     save_path=None,
+    show=False,
 ):
-    fig, ax = plt.subplots()
+    fig, ax = create_figure(show=show)
 
     style_axes(
         fig,
@@ -437,14 +686,18 @@ def line_chart(
     if y_min == 0 and y_max == 1:
         ax.yaxis.set_major_formatter(FuncFormatter(lambda value, _pos: f"{value:.0%}"))
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
+
+    if show:
+        plt.show()
 
-    plt.show()
+    return fig
 
 
+@cached_render
 def multi_line_chart(
     x,
     series,
@@ -456,8 +709,10 @@ def multi_line_chart(
     watermark_path=DEFAULT_LOGO_PATH,
     y_min=None,
     y_max=None,
+    save_path=None,
+    show=False,
 ):
-    fig, ax = plt.subplots()
+    fig, ax = create_figure(show=show)
 
     style_axes(
         fig,
@@ -479,10 +734,18 @@ def multi_line_chart(
     ax.set_ylabel(ylabel)
     ax.legend(frameon=False)
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+
+    if save_path is not None:
+        fig.savefig(save_path)
 
+    if show:
+        plt.show()
 
+    return fig
+
+
+@cached_render
 def bar_chart(
     categories,
     values,
@@ -495,8 +758,10 @@ def bar_chart(
     watermark_path=DEFAULT_LOGO_PATH,
     y_min=None,
     y_max=None,
+    save_path=None,
+    show=False,
 ):
-    fig, ax = plt.subplots()
+    fig, ax = create_figure(show=show)
 
     style_axes(
         fig,
@@ -516,10 +781,18 @@ def bar_chart(
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+
+    if save_path is not None:
+        fig.savefig(save_path)
 
+    if show:
+        plt.show()
 
+    return fig
+
+
+@cached_render
 def histogram_chart(
     values,
     title,
@@ -531,8 +804,10 @@ def histogram_chart(
     watermark_path=DEFAULT_LOGO_PATH,
     reference_line=None,
     reference_label=None,
+    save_path=None,
+    show=False,
 ):
-    fig, ax = plt.subplots()
+    fig, ax = create_figure(show=show)
 
     style_axes(
         fig,
@@ -570,5 +845,168 @@ def histogram_chart(
     ax.set_xlabel(xlabel)
     ax.set_ylabel(ylabel)
 
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+
+    if save_path is not None:
+        fig.savefig(save_path)
+
+    if show:
+        plt.show()
+
+    return fig
+
+
+def heatmap_chart(
+    x,
+    y,
+    values,
+    title,
+    xlabel,
+    ylabel,
+    colorbar_label=None,
+    value_min=0,
+    value_max=1,
+    y_formatter=None,
+    watermark=True,
+    watermark_path=DEFAULT_LOGO_PATH,
+    save_path=None,
+    show=False,
+):
+    # values has one row per y value and one column per x value.
+    fig, ax = create_figure(show=show)
+
+    style_axes(
+        fig,
+        ax,
+        grid=False,
+        zero_line=False,
+        watermark=watermark,
+        watermark_path=watermark_path,
+    )
+
+    colormap = LinearSegmentedColormap.from_list(
+        "accent",
+        [COLORS["secondary_bg"], COLORS["accent"], COLORS["fg"]],
+    )
+    mesh = ax.pcolormesh(
+        x,
+        y,
+        values,
+        cmap=colormap,
+        vmin=value_min,
+        vmax=value_max,
+        shading="nearest",
+        zorder=3,
+    )
+
+    colorbar = fig.colorbar(mesh, ax=ax)
+    colorbar.outline.set_edgecolor(COLORS["border"])
+    colorbar.ax.tick_params(colors=COLORS["fg"], labelsize=10)
+    if value_min == 0 and value_max == 1:
+        colorbar.ax.yaxis.set_major_formatter(
+            FuncFormatter(lambda value, _pos: f"{value:.0%}")
+        )
+    if colorbar_label is not None:
+        colorbar.set_label(colorbar_label)
+
+    if y_formatter is not None:
+        ax.yaxis.set_major_formatter(FuncFormatter(y_formatter))
+
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+
+    fig.tight_layout()
+
+    if save_path is not None:
+        fig.savefig(save_path)
+
+    if show:
+        plt.show()
+
+    return fig
+
+
+def fan_chart(
+    x,
+    bands,
+    title,
+    xlabel,
+    ylabel,
+    starting_value=None,
+    grid=True,
+    watermark=True,
+    watermark_path=DEFAULT_LOGO_PATH,
+    save_path=None,
+    show=False,
+):
+    # bands maps "p5", "p25", "p50", "p75" and "p95" to one value per x, so
+    # the chart is drawn from a summary rather than from every simulated path.
+    fig, ax = create_figure(show=show)
+
+    style_axes(
+        fig,
+        ax,
+        grid=grid,
+        zero_line=False,
+        watermark=watermark,
+        watermark_path=watermark_path,
+    )
+
+    ax.fill_between(
+        x,
+        bands["p5"],
+        bands["p95"],
+        color=COLORS["accent"],
+        alpha=0.16,
+        linewidth=0,
+        label="5th to 95th percentile",
+        zorder=2,
+    )
+    ax.fill_between(
+        x,
+        bands["p25"],
+        bands["p75"],
+        color=COLORS["accent"],
+        alpha=0.32,
+        linewidth=0,
+        label="25th to 75th percentile",
+        zorder=3,
+    )
+    ax.plot(
+        x,
+        bands["p50"],
+        color=COLORS["accent"],
+        linewidth=2.4,
+        label="Median",
+        zorder=4,
+    )
+
+    if starting_value is not None:
+        ax.axhline(
+            starting_value,
+            color=COLORS["muted_fg"],
+            linewidth=1.3,
+            linestyle="--",
+            alpha=0.85,
+            zorder=2,
+        )
+
+    ax.set_xlim(x[0], x[-1])
+    ax.set_ylim(bottom=max(0, ax.get_ylim()[0]))
+    ax.set_title(title)
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.legend(frameon=False, loc="upper left")
+    apply_month_ticks(ax, x[-1])
+    apply_compact_currency_axis(ax)
+
+    fig.tight_layout()
+
+    if save_path is not None:
+        fig.savefig(save_path)
+
+    if show:
+        plt.show()
+
+    return fig
@@ -0,0 +1,23 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--network",
+        action="store_true",
+        help="Run tests that download market data.",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "network: needs to download market data")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--network"):
+        return
+
+    skip_network = pytest.mark.skip(reason="needs --network to download market data")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip_network)
@@ -1,27 +1,45 @@
+import hashlib
 import math
 import random
 import statistics
+import warnings
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 
 import matplotlib
+import numpy as np
+import pandas as pd
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
-
-plt.show = lambda *args, **kwargs: None
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
 
 from chart_creator import (
     COLORS,
     add_logo_watermark,
     apply_compact_currency_axis,
     apply_month_ticks,
+    create_figure,
+    fan_chart,
+    format_compact_currency,
+    heatmap_chart,
     horizon_loss_chart,
     horizon_range_chart,
     line_chart,
+    plot_path_density,
     setup_matplotlib_style,
     style_axes,
 )
+from simulation_cache import SimulationCache
+
+try:
+    from scipy.special import ndtri
+    from scipy.stats import qmc
+except ImportError:
+    qmc = None
 
 
 # 1. Coin toss: basic Monte Carlo intuition
@@ -45,6 +63,18 @@ class Asset:
         self.monthly_return = (1 + self.annual_return) ** (1 / 12) - 1
         self.monthly_volatility = self.annual_volatility / math.sqrt(12)
 
+    def sample_returns(
+        self,
+        rng: np.random.Generator,
+        simulations: int,
+        months: int,
+    ) -> np.ndarray:
+        return rng.normal(
+            self.monthly_return,
+            self.monthly_volatility,
+            size=(simulations, months),
+        )
+
 
 @dataclass
 class WithdrawalScenario:
@@ -59,31 +89,180 @@ class WithdrawalScenario:
         self.monthly_withdrawal = self.annual_withdrawal / 12
 
 
+@dataclass
+class WithdrawalPolicy:
+    name: str
+    annual_withdrawal: float | None = None
+    reduced_monthly_withdrawal: float | None = None
+    reduction_after_month: int | None = None
+    portfolio_rate: float = 0.0
+    guardrail_upper_rate: float | None = None
+    guardrail_lower_rate: float | None = None
+    guardrail_adjustment: float = 0.1
+    review_months: int = 12
+
+    @classmethod
+    def fixed(cls, name: str = "Fixed", annual_withdrawal: float | None = None):
+        return cls(name=name, annual_withdrawal=annual_withdrawal)
+
+    @classmethod
+    def reduced_after_month(
+        cls,
+        reduced_monthly_withdrawal: float,
+        reduction_after_month: int,
+        name: str = "Reduced after month",
+    ):
+        return cls(
+            name=name,
+            reduced_monthly_withdrawal=reduced_monthly_withdrawal,
+            reduction_after_month=reduction_after_month,
+        )
+
+    @classmethod
+    def guardrails(
+        cls,
+        upper_rate: float,
+        lower_rate: float,
+        adjustment: float = 0.1,
+        review_months: int = 12,
+        name: str = "Guardrails",
+    ):
+        return cls(
+            name=name,
+            guardrail_upper_rate=upper_rate,
+            guardrail_lower_rate=lower_rate,
+            guardrail_adjustment=adjustment,
+            review_months=review_months,
+        )
+
+    @classmethod
+    def percent_of_portfolio(cls, annual_rate: float, name: str = "Percent of portfolio"):
+        return cls(name=name, annual_withdrawal=0.0, portfolio_rate=annual_rate)
+
+    def monthly_schedule(self, scenario: WithdrawalScenario) -> np.ndarray:
+        if self.annual_withdrawal is None:
+            monthly_withdrawal = scenario.monthly_withdrawal
+        else:
+            monthly_withdrawal = self.annual_withdrawal / 12
+
+        schedule = np.full(scenario.months, monthly_withdrawal, dtype=np.float64)
+
+        if (
+            self.reduced_monthly_withdrawal is not None
+            and self.reduction_after_month is not None
+        ):
+            schedule[self.reduction_after_month :] = self.reduced_monthly_withdrawal
+
+        return schedule
+
+
+SIMULATION_ENGINES = ("python", "numpy")
+VARIANCE_REDUCTION_METHODS = ("antithetic", "control_variate", "sobol")
+FAN_CHART_PERCENTILES = (5, 25, 50, 75, 95)
+PATH_RETENTION_POLICIES = ("summary", "sample", "all")
+PATH_STYLES = ("lines", "density")
+DENSITY_VALUE_BINS = 160
+
+
+# ---------------------------------------------------------------------------
+# Random number streams
+# ---------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class SimulationStreams:
+    # The same key always gives the same stream, whatever order or process it
+    # is requested in.
+    seed: int
+
+    @classmethod
+    def from_entropy(cls) -> "SimulationStreams":
+        return cls(seed=np.random.SeedSequence().entropy)
+
+    def seed_sequence(self, *key) -> np.random.SeedSequence:
+        return np.random.SeedSequence(
+            self.seed,
+            spawn_key=tuple(
+                value for part in key for value in stream_key_part(part)
+            ),
+        )
+
+    def generator(self, *key) -> np.random.Generator:
+        return np.random.default_rng(self.seed_sequence(*key))
+
+    def python_random(self, *key) -> random.Random:
+        state = self.seed_sequence(*key).generate_state(4, dtype=np.uint64)
+        return random.Random(int.from_bytes(state.tobytes(), "little"))
+
+    def rng(self, engine: str, *key) -> random.Random | np.random.Generator:
+        validate_engine(engine)
+
+        if engine == "numpy":
+            return self.generator(*key)
+
+        return self.python_random(*key)
+
+
+STREAM_KEY_INTEGER = 0
+STREAM_KEY_LABEL = 1
+
+
+def stream_key_part(part) -> tuple[int, int]:
+    # Each part becomes a (type, value) pair, so the integer 3 and a label
+    # that happens to hash to 3 give different streams.
+    if (
+        isinstance(part, (int, np.integer))
+        and not isinstance(part, bool)
+        and part >= 0
+    ):
+        return STREAM_KEY_INTEGER, int(part)
+
+    # Strings and other labels map to a stable 64-bit value, unlike hash().
+    digest = hashlib.sha256(str(part).encode("utf-8")).digest()
+    return STREAM_KEY_LABEL, int.from_bytes(digest[:8], "little")
+
+
 # ---------------------------------------------------------------------------
 # Coin toss example
 # ---------------------------------------------------------------------------
 
 
-def coin_toss_simulation(trials: int) -> list[int]:
-    return [random.randint(0, 1) for _ in range(trials)]
+def coin_toss_simulation(
+    trials: int,
+    rng: random.Random | np.random.Generator | None = None,
+) -> list[int] | np.ndarray:
+    if isinstance(rng, np.random.Generator):
+        return rng.integers(0, 2, size=trials, dtype=np.int8)
+
+    rng = rng or random
+    return [rng.randint(0, 1) for _ in range(trials)]
 
 
-def calculate_running_average(values: list[float]) -> list[float]:
-    running_average = []
+def calculate_running_average(values: list[float] | np.ndarray) -> list[float] | np.ndarray:
+    running_average = np.cumsum(values, dtype=np.float64) / np.arange(
+        1,
+        len(values) + 1,
+    )
 
-    for period in range(1, len(values) + 1):
-        running_average.append(statistics.mean(values[:period]))
+    if isinstance(values, np.ndarray):
+        return running_average
 
-    return running_average
+    return running_average.tolist()
 
 
-def chart_coin_toss_example(save_path=None):
-    trials = 300
-    results = coin_toss_simulation(trials)
+def chart_coin_toss_example(
+    save_path=None,
+    rng: random.Random | np.random.Generator | None = None,
+    trials: int = 300,
+    results: list[int] | np.ndarray | None = None,
+):
+    if results is None:
+        results = coin_toss_simulation(trials, rng)
+    trials = len(results)
     running_average = calculate_running_average(results)
-    trial_numbers = list(range(1, trials + 1))
+    trial_numbers = np.arange(1, trials + 1)
 
-    line_chart(
+    return line_chart(
         x=trial_numbers,
         y=running_average,
         title="Coin Toss Results Converge Towards 50%",
@@ -102,9 +281,14 @@ def chart_coin_toss_example(save_path=None):
 # ---------------------------------------------------------------------------
 
 
-def generate_monthly_returns(asset: Asset, months: int) -> list[float]:
+def generate_monthly_returns(
+    asset: Asset,
+    months: int,
+    rng: random.Random | None = None,
+) -> list[float]:
+    rng = rng or random
     return [
-        random.normalvariate(asset.monthly_return, asset.monthly_volatility)
+        rng.normalvariate(asset.monthly_return, asset.monthly_volatility)
         for _ in range(months)
     ]
 
@@ -121,16 +305,157 @@ def calculate_portfolio_values(
     return values
 
 
+def generate_monthly_return_matrix(
+    asset: Asset,
+    months: int,
+    simulations: int,
+    rng: np.random.Generator | None = None,
+    variance_reduction: str | None = None,
+) -> np.ndarray:
+    validate_variance_reduction(variance_reduction)
+
+    if rng is None:
+        rng = np.random.default_rng()
+
+    if variance_reduction in ("antithetic", "sobol"):
+        if not isinstance(asset, Asset):
+            raise ValueError(
+                f"{variance_reduction} draws are only available for normal Asset returns."
+            )
+
+        if variance_reduction == "antithetic":
+            half = rng.standard_normal(((simulations + 1) // 2, months))
+            shocks = np.concatenate([half, -half])[:simulations]
+        else:
+            shocks = generate_sobol_normal_matrix(months, simulations, rng)
+
+        return asset.monthly_return + asset.monthly_volatility * shocks
+
+    return asset.sample_returns(rng, simulations, months)
+
+
+def generate_sobol_normal_matrix(
+    months: int,
+    simulations: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    if qmc is None:
+        raise ImportError("Sobol draws need scipy. Install it with: pip install scipy")
+
+    sampler = qmc.Sobol(d=months, scramble=True, seed=rng)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        uniforms = sampler.random(simulations)
+
+    # Keep away from exactly 0 or 1, where the inverse normal is infinite.
+    return ndtri(np.clip(uniforms, 1e-12, 1 - 1e-12))
+
+
+def validate_variance_reduction(variance_reduction: str | None):
+    if (
+        variance_reduction is not None
+        and variance_reduction not in VARIANCE_REDUCTION_METHODS
+    ):
+        raise ValueError(
+            f"Unknown variance reduction {variance_reduction!r}. "
+            f"Expected one of {', '.join(VARIANCE_REDUCTION_METHODS)}."
+        )
+
+
+def expected_growth_factor(asset: Asset, months: int) -> float:
+    # Not the mean for serially dependent return models (regimes, volatility
+    # clustering, bootstrapped blocks or drifting weights).
+    validate_control_variate_source(asset, "control_variate")
+    return (1 + asset.monthly_return) ** months
+
+
+def validate_control_variate_source(asset, variance_reduction: str | None):
+    if variance_reduction == "control_variate" and not isinstance(asset, Asset):
+        raise ValueError(
+            "Control variates need independent normal Asset returns; "
+            f"{type(asset).__name__} has no known expected growth factor."
+        )
+
+
+def control_variate_estimate(samples, control, control_mean: float) -> float:
+    samples = np.asarray(samples, dtype=np.float64)
+    control = np.asarray(control, dtype=np.float64)
+    control_deviation = control - control.mean()
+    control_variance = np.mean(control_deviation**2)
+
+    if control_variance == 0:
+        return float(samples.mean())
+
+    slope = np.mean((samples - samples.mean()) * control_deviation) / control_variance
+    return float(samples.mean() - slope * (control.mean() - control_mean))
+
+
+def calculate_portfolio_value_matrix(
+    returns: np.ndarray,
+    starting_value: float,
+) -> np.ndarray:
+    simulations, months = returns.shape
+    values = np.empty((simulations, months + 1), dtype=np.float64)
+    values[:, 0] = starting_value
+    np.cumprod(1 + returns, axis=1, out=values[:, 1:])
+    values[:, 1:] *= starting_value
+
+    return values
+
+
+def validate_engine(engine: str):
+    if engine not in SIMULATION_ENGINES:
+        raise ValueError(
+            f"Unknown simulation engine {engine!r}. "
+            f"Expected one of {', '.join(SIMULATION_ENGINES)}."
+        )
+
+
+def validate_return_source(engine: str, asset, variance_reduction: str | None = None):
+    if engine == "python" and not isinstance(asset, Asset):
+        raise ValueError("Return models need the numpy engine.")
+
+    validate_control_variate_source(asset, variance_reduction)
+
+
+def validate_engine_variance_reduction(engine: str, variance_reduction: str | None):
+    validate_variance_reduction(variance_reduction)
+
+    if engine == "python" and variance_reduction in ("antithetic", "sobol"):
+        raise ValueError(
+            f"{variance_reduction} draws need the numpy engine. "
+            "Control variates work with either engine."
+        )
+
+
 def run_monte_carlo_simulation(
     asset: Asset,
     months: int,
     starting_value: float,
     simulations: int,
-) -> list[list[float]]:
+    engine: str = "python",
+    rng: random.Random | np.random.Generator | None = None,
+    variance_reduction: str | None = None,
+) -> list[list[float]] | np.ndarray:
+    validate_engine(engine)
+    validate_engine_variance_reduction(engine, variance_reduction)
+    validate_return_source(engine, asset, variance_reduction)
+
+    if engine == "numpy":
+        returns = generate_monthly_return_matrix(
+            asset,
+            months,
+            simulations,
+            rng,
+            variance_reduction,
+        )
+        return calculate_portfolio_value_matrix(returns, starting_value)
+
     paths = []
 
     for _ in range(simulations):
-        returns = generate_monthly_returns(asset, months)
+        returns = generate_monthly_returns(asset, months, rng)
         paths.append(calculate_portfolio_values(returns, starting_value))
 
     return paths
@@ -141,21 +466,48 @@ def percentile(sorted_values: list[float], percentile_value: float) -> float:
     return sorted_values[index]
 
 
-def summarise_final_values(final_values: list[float], starting_value: float) -> dict:
-    sorted_values = sorted(final_values)
-
-    return {
-        "mean": statistics.mean(final_values),
-        "median": statistics.median(final_values),
-        "loss_probability": sum(value < starting_value for value in final_values)
-        / len(final_values),
-        "p5": percentile(sorted_values, 0.05),
-        "p95": percentile(sorted_values, 0.95),
+def summarise_final_values(
+    final_values: list[float],
+    starting_value: float,
+    control_mean: float | None = None,
+) -> dict:
+    final_values = np.asarray(final_values, dtype=np.float64)
+    sorted_values = np.sort(final_values)
+    summary = {
+        "mean": float(final_values.mean()),
+        "median": float(np.median(sorted_values)),
+        "loss_probability": float((final_values < starting_value).mean()),
+        "p5": float(percentile(sorted_values, 0.05)),
+        "p95": float(percentile(sorted_values, 0.95)),
     }
 
+    if control_mean is not None:
+        summary["mean"] = control_variate_estimate(
+            final_values,
+            final_values,
+            control_mean,
+        )
+        summary["loss_probability"] = min(
+            1.0,
+            max(
+                0.0,
+                control_variate_estimate(
+                    final_values < starting_value,
+                    final_values,
+                    control_mean,
+                ),
+            ),
+        )
+
+    return summary
 
-def verify_asset_return_model(asset: Asset, sample_months: int = 100_000) -> dict:
-    monthly_returns = generate_monthly_returns(asset, sample_months)
+
+def verify_asset_return_model(
+    asset: Asset,
+    sample_months: int = 100_000,
+    rng: random.Random | None = None,
+) -> dict:
+    monthly_returns = generate_monthly_returns(asset, sample_months, rng)
 
     return {
         "asset": asset.name,
@@ -197,25 +549,129 @@ def run_horizon_analysis(
     horizons_months: list[int],
     starting_value: float,
     simulations: int,
+    engine: str = "python",
+    rng: random.Random | np.random.Generator | None = None,
+    independent_horizons: bool = True,
+    streams: SimulationStreams | None = None,
+    cache: SimulationCache | None = None,
+    variance_reduction: str | None = None,
+    path_retention: str = "all",
+    sampled_paths: int = 20,
+    path_horizons: list[int] | None = None,
+    chunk_size: int | None = None,
 ) -> list[dict]:
-    results = []
+    # Each chunk continues the same random stream, so plain normal draws do not
+    # depend on chunk_size.
+    if cache is not None and streams is None:
+        raise ValueError("Caching simulations needs streams to identify the draws.")
+    if rng is not None and streams is not None:
+        raise ValueError("Pass either rng or streams, not both.")
+
+    validate_engine_variance_reduction(engine, variance_reduction)
+    validate_control_variate_source(asset, variance_reduction)
+    validate_path_retention(path_retention)
+    validate_chunk_size(chunk_size)
+    chunk_size = chunk_size or simulations
+    chunk_sizes = [
+        min(chunk_size, simulations - start)
+        for start in range(0, simulations, chunk_size)
+    ]
 
-    for months in horizons_months:
-        paths = run_monte_carlo_simulation(
+    def simulate_chunks(months, *key):
+        stream_key = ("horizon", asset.name, *key)
+        chunk_rng = rng if streams is None else streams.rng(engine, *stream_key)
+
+        def build():
+            for chunk_simulations in chunk_sizes:
+                yield run_monte_carlo_simulation(
+                    asset=asset,
+                    months=months,
+                    starting_value=starting_value,
+                    simulations=chunk_simulations,
+                    engine=engine,
+                    rng=chunk_rng,
+                    variance_reduction=variance_reduction,
+                )
+
+        if cache is None:
+            yield from build()
+            return
+
+        # Every chunk draws from the same stream, so the chunk size changes the
+        # draws and is part of the key.
+        paths = cache.get_or_create_chunks(
+            build,
+            shape=(simulations, months + 1),
+            kind="horizon_paths",
             asset=asset,
             months=months,
             starting_value=starting_value,
             simulations=simulations,
+            chunk_size=chunk_size,
+            engine=engine,
+            variance_reduction=variance_reduction,
+            seed=streams.seed,
+            stream_key=stream_key,
         )
-        final_values = [path[-1] for path in paths]
-        summary = summarise_final_values(final_values, starting_value)
+        for start in range(0, simulations, chunk_size):
+            chunk = paths[start : start + chunk_size]
+            yield chunk.tolist() if engine == "python" else chunk
+
+    if independent_horizons:
+        simulation_runs = [
+            (months, [months], simulate_chunks(months, months))
+            for months in horizons_months
+        ]
+    else:
+        longest_horizon = max(horizons_months)
+        simulation_runs = [
+            (
+                longest_horizon,
+                horizons_months,
+                simulate_chunks(longest_horizon, "shared", longest_horizon),
+            )
+        ]
+
+    final_value_chunks = {months: [] for months in horizons_months}
+    path_chunks = {months: [] for months in horizons_months}
+    retained_path_counts = dict.fromkeys(horizons_months, 0)
+
+    for _, run_horizons, chunks in simulation_runs:
+        for chunk in chunks:
+            for months in run_horizons:
+                paths = slice_paths_to_horizon(chunk, months)
+                # Copies, so the chunk itself can be freed once it is summarised.
+                final_value_chunks[months].append(
+                    copy_path_chunk(final_values_from_paths(paths))
+                )
+
+                keep_count = paths_to_keep(
+                    path_retention,
+                    path_horizons,
+                    months,
+                    sampled_paths,
+                    retained_path_counts[months],
+                    len(paths),
+                )
+                if keep_count:
+                    path_chunks[months].append(copy_path_chunk(paths[:keep_count]))
+                    retained_path_counts[months] += keep_count
+
+    results = []
+
+    for months in horizons_months:
+        final_values = combine_path_chunks(final_value_chunks[months])
+        control_mean = None
+        if variance_reduction == "control_variate":
+            control_mean = starting_value * expected_growth_factor(asset, months)
+        summary = summarise_final_values(final_values, starting_value, control_mean)
 
         results.append(
             {
                 "asset": asset.name,
                 "months": months,
                 "years": months / 12,
-                "paths": paths,
+                "paths": combine_path_chunks(path_chunks[months]),
                 "final_values": final_values,
                 "summary": summary,
             }
@@ -224,6 +680,76 @@ def run_horizon_analysis(
     return results
 
 
+def validate_chunk_size(chunk_size: int | None):
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError(
+            f"chunk_size must be a positive number of simulations, got {chunk_size}."
+        )
+
+
+def validate_path_retention(path_retention: str):
+    if path_retention not in PATH_RETENTION_POLICIES:
+        raise ValueError(
+            f"Unknown path retention {path_retention!r}. "
+            f"Use one of: {', '.join(PATH_RETENTION_POLICIES)}."
+        )
+
+
+def paths_to_keep(
+    path_retention: str,
+    path_horizons: list[int] | None,
+    months: int,
+    sampled_paths: int,
+    already_kept: int,
+    chunk_paths: int,
+) -> int:
+    if path_retention == "summary":
+        return 0
+    if path_horizons is not None and months not in path_horizons:
+        return 0
+    if path_retention == "sample":
+        return max(0, min(sampled_paths - already_kept, chunk_paths))
+
+    return chunk_paths
+
+
+def copy_path_chunk(values: list | np.ndarray) -> list | np.ndarray:
+    if isinstance(values, np.ndarray):
+        return np.array(values)
+
+    return list(values)
+
+
+def combine_path_chunks(chunks: list) -> list | np.ndarray | None:
+    if not chunks:
+        return None
+    if len(chunks) == 1:
+        return chunks[0]
+    if isinstance(chunks[0], np.ndarray):
+        return np.concatenate(chunks)
+
+    return [value for chunk in chunks for value in chunk]
+
+
+def final_values_from_paths(
+    paths: list[list[float]] | np.ndarray,
+) -> list[float] | np.ndarray:
+    if isinstance(paths, np.ndarray):
+        return paths[:, -1]
+
+    return [path[-1] for path in paths]
+
+
+def slice_paths_to_horizon(
+    paths: list[list[float]] | np.ndarray,
+    months: int,
+) -> list[list[float]] | np.ndarray:
+    if isinstance(paths, np.ndarray):
+        return paths[:, : months + 1]
+
+    return [path[: months + 1] for path in paths]
+
+
 def print_horizon_summary(results: list[dict]):
     print("\nGrowth asset horizon analysis")
 
@@ -256,25 +782,16 @@ def find_horizon_result(results: list[dict], horizon_months: int) -> dict:
     raise ValueError(f"No result found for {horizon_months} months.")
 
 
-def chart_simulated_paths(
+def print_simulated_path_summary(
     results: list[dict],
     horizon_months: int,
-    number_of_paths: int,
     starting_value: float,
     expected_annual_return: float,
-    save_path=None,
 ):
-    selected_result = find_horizon_result(results, horizon_months)
-    paths = selected_result["paths"][:number_of_paths]
-    final_values = selected_result["final_values"]
-    median_final_value = selected_result["summary"]["median"]
+    median_final_value = find_horizon_result(results, horizon_months)["summary"]["median"]
     median_annualised_growth_rate = (
         (median_final_value / starting_value) ** (12 / horizon_months) - 1
     )
-    expected_final_value = starting_value * (
-        1 + expected_annual_return
-    ) ** (horizon_months / 12)
-    month_numbers = list(range(0, horizon_months + 1))
 
     print(
         "\n120 month growth asset final value distribution"
@@ -283,7 +800,67 @@ def chart_simulated_paths(
         f"\nInput annual return assumption: {expected_annual_return:.1%}"
     )
 
-    fig, (path_ax, hist_ax) = plt.subplots(
+
+def build_horizon_chart_summary(
+    results: list[dict],
+    horizon_months: int,
+    number_of_paths: int,
+    path_style: str = "lines",
+) -> dict:
+    validate_path_style(path_style)
+    selected_result = find_horizon_result(results, horizon_months)
+    if selected_result["paths"] is None:
+        raise ValueError(
+            f"Paths for {horizon_months} months were not kept. "
+            "Run the horizon analysis with path_retention 'sample' or 'all'."
+        )
+
+    paths = np.asarray(selected_result["paths"], dtype=np.float64)
+    final_values = np.asarray(selected_result["final_values"], dtype=np.float64)
+    density_edges = None
+    if path_style == "density":
+        y_min, y_max = padded_value_limits(
+            min(paths.min(), final_values.min()),
+            max(paths.max(), final_values.max()),
+        )
+        density_edges = np.linspace(y_min, y_max, DENSITY_VALUE_BINS + 1)
+
+    return build_path_chart_summary(
+        paths,
+        number_of_paths,
+        final_values=final_values,
+        density_edges=density_edges,
+    )
+
+
+def padded_value_limits(lower: float, upper: float) -> tuple[float, float]:
+    padding = (upper - lower) * 0.1
+    return max(0, lower - padding), upper + padding
+
+
+def chart_simulated_paths(
+    chart_summary: dict,
+    starting_value: float,
+    expected_annual_return: float,
+    save_path=None,
+    path_style: str = "lines",
+):
+    validate_path_style(path_style)
+    horizon_months = chart_summary["months"]
+    histogram = chart_summary["final_value_histogram"]
+    if path_style == "density":
+        if chart_summary["path_density"] is None:
+            raise ValueError("Build the chart summary with path_style 'density'.")
+        value_low, value_high = chart_summary["value_range"]
+    else:
+        paths = chart_summary["sample_paths"]
+        value_low, value_high = paths.min(), paths.max()
+    expected_final_value = starting_value * (
+        1 + expected_annual_return
+    ) ** (horizon_months / 12)
+    month_numbers = list(range(0, horizon_months + 1))
+
+    fig, (path_ax, hist_ax) = create_figure(
         ncols=2,
         sharey=True,
         gridspec_kw={"width_ratios": [2.15, 1], "wspace": 0.04},
@@ -291,22 +868,22 @@ def chart_simulated_paths(
     style_axes(fig, path_ax, grid=True, zero_line=False, watermark=False)
     style_axes(fig, hist_ax, grid=True, zero_line=False, watermark=False)
 
-    for path in paths:
-        path_ax.plot(
-            month_numbers,
-            path,
-            color=COLORS["accent"],
-            linewidth=1.7,
-            alpha=0.34,
-            zorder=3,
-        )
+    lower = min(value_low, histogram["edges"][0], starting_value)
+    upper = max(value_high, histogram["edges"][-1], starting_value)
+    y_min, y_max = padded_value_limits(lower, upper)
 
-    all_values = [value for path in paths for value in path] + final_values
-    lower = min(all_values + [starting_value])
-    upper = max(all_values + [starting_value])
-    padding = (upper - lower) * 0.1
-    y_min = max(0, lower - padding)
-    y_max = upper + padding
+    if path_style == "density":
+        plot_path_density(path_ax, chart_summary["path_density"], zorder=3)
+    else:
+        for path in paths:
+            path_ax.plot(
+                month_numbers,
+                path,
+                color=COLORS["accent"],
+                linewidth=1.7,
+                alpha=0.34,
+                zorder=3,
+            )
 
     path_ax.axhline(
         starting_value,
@@ -326,9 +903,9 @@ def chart_simulated_paths(
         fontsize=10,
     )
 
-    hist_ax.hist(
-        final_values,
-        bins=34,
+    plot_histogram_counts(
+        hist_ax,
+        histogram,
         orientation="horizontal",
         color=COLORS["muted_fg"],
         edgecolor="none",
@@ -380,16 +957,16 @@ def chart_simulated_paths(
     fig.subplots_adjust(left=0.08, right=0.94, top=0.88, bottom=0.12, wspace=0.04)
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
 
-    plt.show()
+    return fig
 
 
 def chart_loss_probability_by_horizon(results: list[dict], save_path=None):
     categories = [format_horizon_label(result["months"]) for result in results]
     values = [result["summary"]["loss_probability"] * 100 for result in results]
 
-    horizon_loss_chart(
+    return horizon_loss_chart(
         categories=categories,
         values=values,
         title="Chance of Finishing Below the Starting Value",
@@ -409,7 +986,7 @@ def chart_percentile_range_by_horizon(
     median_values = [result["summary"]["median"] for result in results]
     p95_values = [result["summary"]["p95"] for result in results]
 
-    horizon_range_chart(
+    return horizon_range_chart(
         categories=categories,
         p5_values=p5_values,
         median_values=median_values,
@@ -427,8 +1004,12 @@ def chart_percentile_range_by_horizon(
 # ---------------------------------------------------------------------------
 
 
-def simulate_withdrawal_path(asset: Asset, scenario: WithdrawalScenario) -> dict:
-    returns = generate_monthly_returns(asset, scenario.months)
+def simulate_withdrawal_path(
+    asset: Asset,
+    scenario: WithdrawalScenario,
+    rng: random.Random | None = None,
+) -> dict:
+    returns = generate_monthly_returns(asset, scenario.months, rng)
     return calculate_withdrawal_result_from_returns(
         asset_name=asset.name,
         returns=returns,
@@ -501,18 +1082,330 @@ def calculate_withdrawal_values_for_rule(
     return values
 
 
+@dataclass
+class WithdrawalResults:
+    # Integer indexing returns a read-only row with the same keys as
+    # calculate_withdrawal_result_from_returns().
+    asset: str
+    months: int
+    final_value: np.ndarray
+    breached_reserve_floor: np.ndarray
+    depleted: np.ndarray
+    first_depletion_month: np.ndarray
+    returns: np.ndarray | None = None
+    values: np.ndarray | None = None
+    growth_factor: np.ndarray | None = None
+
+    @classmethod
+    def from_results(cls, results: list[dict]) -> "WithdrawalResults":
+        returns = np.array([result["returns"] for result in results], dtype=np.float64)
+
+        return cls(
+            asset=results[0]["asset"],
+            months=len(results[0]["values"]) - 1,
+            final_value=np.array(
+                [result["final_value"] for result in results],
+                dtype=np.float64,
+            ),
+            breached_reserve_floor=np.array(
+                [result["breached_reserve_floor"] for result in results],
+                dtype=bool,
+            ),
+            depleted=np.array([result["depleted"] for result in results], dtype=bool),
+            first_depletion_month=np.array(
+                [
+                    -1
+                    if result["first_depletion_month"] is None
+                    else result["first_depletion_month"]
+                    for result in results
+                ],
+                dtype=np.int64,
+            ),
+            returns=returns,
+            values=np.array([result["values"] for result in results], dtype=np.float64),
+            growth_factor=np.prod(1 + returns, axis=1),
+        )
+
+    @classmethod
+    def concatenate(cls, parts: list["WithdrawalResults"]) -> "WithdrawalResults":
+        if len(parts) == 1:
+            return parts[0]
+
+        def join(name):
+            columns = [getattr(part, name) for part in parts]
+            if any(column is None for column in columns):
+                return None
+            return np.concatenate(columns)
+
+        return cls(
+            asset=parts[0].asset,
+            months=parts[0].months,
+            final_value=join("final_value"),
+            breached_reserve_floor=join("breached_reserve_floor"),
+            depleted=join("depleted"),
+            first_depletion_month=join("first_depletion_month"),
+            returns=join("returns"),
+            values=join("values"),
+            growth_factor=join("growth_factor"),
+        )
+
+    @property
+    def stayed_above_reserve_floor(self) -> np.ndarray:
+        return ~self.breached_reserve_floor
+
+    @property
+    def funded_all_withdrawals(self) -> np.ndarray:
+        return ~self.depleted
+
+    def __len__(self) -> int:
+        return len(self.final_value)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield WithdrawalResultRow(self, index)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if index < 0:
+                index += len(self)
+            if not 0 <= index < len(self):
+                raise IndexError("Withdrawal result index out of range.")
+            return WithdrawalResultRow(self, int(index))
+
+        return self.take(index)
+
+    def take(self, indices) -> "WithdrawalResults":
+        return WithdrawalResults(
+            asset=self.asset,
+            months=self.months,
+            final_value=self.final_value[indices],
+            breached_reserve_floor=self.breached_reserve_floor[indices],
+            depleted=self.depleted[indices],
+            first_depletion_month=self.first_depletion_month[indices],
+            returns=None if self.returns is None else self.returns[indices],
+            values=None if self.values is None else self.values[indices],
+            growth_factor=(
+                None if self.growth_factor is None else self.growth_factor[indices]
+            ),
+        )
+
+    def column(self, key: str):
+        if key == "asset":
+            return self.asset
+
+        column = getattr(self, key, None)
+        if key not in WITHDRAWAL_RESULT_KEYS or column is None:
+            raise KeyError(f"Withdrawal results do not hold {key!r}.")
+
+        return column
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            array.nbytes
+            for array in [
+                self.final_value,
+                self.breached_reserve_floor,
+                self.depleted,
+                self.first_depletion_month,
+                self.returns,
+                self.values,
+                self.growth_factor,
+            ]
+            if array is not None
+        )
+
+
+WITHDRAWAL_RESULT_KEYS = (
+    "asset",
+    "returns",
+    "values",
+    "final_value",
+    "breached_reserve_floor",
+    "stayed_above_reserve_floor",
+    "depleted",
+    "funded_all_withdrawals",
+    "first_depletion_month",
+)
+
+
+class WithdrawalResultRow(Mapping):
+    __slots__ = ("results", "index")
+
+    def __init__(self, results: WithdrawalResults, index: int):
+        self.results = results
+        self.index = index
+
+    def __getitem__(self, key: str):
+        value = self.results.column(key)
+
+        if key == "asset":
+            return value
+        if key in ("returns", "values"):
+            return value[self.index]
+        if key == "first_depletion_month":
+            month = int(value[self.index])
+            return None if month < 0 else month
+        if key == "final_value":
+            return float(value[self.index])
+
+        return bool(value[self.index])
+
+    def __iter__(self):
+        return iter(WITHDRAWAL_RESULT_KEYS)
+
+    def __len__(self) -> int:
+        return len(WITHDRAWAL_RESULT_KEYS)
+
+
+def calculate_withdrawal_batch(
+    asset_name: str,
+    returns: np.ndarray,
+    scenario: WithdrawalScenario,
+    reduced_monthly_withdrawal: float | None = None,
+    reduction_after_month: int | None = None,
+    keep_paths: bool = True,
+    path_dtype=np.float64,
+) -> WithdrawalResults:
+    # Paths at zero stay at zero, matching calculate_withdrawal_values_for_rule().
+    simulations, months = returns.shape
+    portfolio_values = np.full(simulations, scenario.starting_value, dtype=np.float64)
+    lowest_values = portfolio_values.copy()
+    growth_factor = np.ones(simulations, dtype=np.float64)
+    first_depletion_month = np.full(simulations, -1, dtype=np.int64)
+    values = None
+
+    if keep_paths:
+        values = np.empty((simulations, months + 1), dtype=path_dtype)
+        values[:, 0] = portfolio_values
+
+    if scenario.starting_value <= 0:
+        first_depletion_month[:] = 0
+
+    for month in range(1, months + 1):
+        monthly_withdrawal = scenario.monthly_withdrawal
+        if (
+            reduced_monthly_withdrawal is not None
+            and reduction_after_month is not None
+            and month > reduction_after_month
+        ):
+            monthly_withdrawal = reduced_monthly_withdrawal
+
+        active = portfolio_values > 0
+        portfolio_values = np.where(
+            active,
+            portfolio_values * (1 + returns[:, month - 1]) - monthly_withdrawal,
+            portfolio_values,
+        )
+        np.maximum(portfolio_values, 0, out=portfolio_values)
+
+        newly_depleted = active & (portfolio_values <= 0)
+        first_depletion_month[newly_depleted] = month
+        np.minimum(lowest_values, portfolio_values, out=lowest_values)
+        growth_factor *= 1 + returns[:, month - 1]
+
+        if keep_paths:
+            values[:, month] = portfolio_values
+
+    return WithdrawalResults(
+        asset=asset_name,
+        months=months,
+        final_value=portfolio_values,
+        breached_reserve_floor=lowest_values < scenario.reserve_floor,
+        depleted=first_depletion_month >= 0,
+        first_depletion_month=first_depletion_month,
+        returns=returns.astype(path_dtype, copy=False) if keep_paths else None,
+        values=values,
+        growth_factor=growth_factor,
+    )
+
+
 def run_withdrawal_monte_carlo(
     asset: Asset,
     scenario: WithdrawalScenario,
     simulations: int,
-) -> list[dict]:
-    return [
-        simulate_withdrawal_path(asset=asset, scenario=scenario)
-        for _ in range(simulations)
-    ]
+    engine: str = "python",
+    rng: random.Random | np.random.Generator | None = None,
+    keep_paths: bool = True,
+    variance_reduction: str | None = None,
+) -> WithdrawalResults:
+    # The python engine still draws each path in the original order, so seeded
+    # runs match the per-path dict results exactly.
+    returns = draw_withdrawal_returns(
+        asset,
+        scenario,
+        simulations,
+        engine,
+        rng,
+        variance_reduction,
+    )
+
+    return calculate_withdrawal_batch(
+        asset_name=asset.name,
+        returns=returns,
+        scenario=scenario,
+        keep_paths=keep_paths,
+    )
+
+
+def draw_withdrawal_returns(
+    asset: Asset,
+    scenario: WithdrawalScenario,
+    simulations: int,
+    engine: str = "python",
+    rng: random.Random | np.random.Generator | None = None,
+    variance_reduction: str | None = None,
+) -> np.ndarray:
+    validate_engine(engine)
+    validate_engine_variance_reduction(engine, variance_reduction)
+    validate_return_source(engine, asset, variance_reduction)
+
+    if engine == "numpy":
+        return generate_monthly_return_matrix(
+            asset,
+            scenario.months,
+            simulations,
+            rng,
+            variance_reduction,
+        )
+
+    return np.array(
+        [
+            generate_monthly_returns(asset, scenario.months, rng)
+            for _ in range(simulations)
+        ],
+        dtype=np.float64,
+    ).reshape(simulations, scenario.months)
+
+
+def summarise_withdrawal_results(
+    results: list[dict] | WithdrawalResults,
+    control_mean: float | None = None,
+) -> dict:
+    if isinstance(results, WithdrawalResults):
+        summary = StreamingWithdrawalSummary(
+            months=results.months,
+            exact_limit=len(results),
+        )
+        summary.update(
+            final_values=results.final_value,
+            breached_reserve_floor=results.breached_reserve_floor,
+            depleted=results.depleted,
+            first_depletion_month=results.first_depletion_month,
+        )
+        summary = summary.summary()
+
+        if control_mean is not None:
+            apply_withdrawal_control_variate(summary, results, control_mean)
 
+        return summary
+
+    if control_mean is not None:
+        return summarise_withdrawal_results(
+            WithdrawalResults.from_results(results),
+            control_mean,
+        )
 
-def summarise_withdrawal_results(results: list[dict]) -> dict:
     final_values = [result["final_value"] for result in results]
     sorted_final_values = sorted(final_values)
     depleted_results = [result for result in results if result["depleted"]]
@@ -558,8 +1451,37 @@ def summarise_withdrawal_results(results: list[dict]) -> dict:
     }
 
 
-def build_withdrawal_portfolios() -> list[Asset]:
-    return [
+def apply_withdrawal_control_variate(
+    summary: dict,
+    results: WithdrawalResults,
+    control_mean: float,
+):
+    indicators = {
+        "reserve_breach_probability": results.breached_reserve_floor,
+        "breached_not_depleted_probability": results.breached_reserve_floor
+        & ~results.depleted,
+        "depletion_probability": results.depleted,
+    }
+
+    for key, indicator in indicators.items():
+        summary[key] = min(
+            1.0,
+            max(
+                0.0,
+                control_variate_estimate(
+                    indicator,
+                    results.growth_factor,
+                    control_mean,
+                ),
+            ),
+        )
+
+    summary["funding_success_probability"] = 1 - summary["depletion_probability"]
+    summary["reserve_success_probability"] = 1 - summary["reserve_breach_probability"]
+
+
+def build_withdrawal_portfolios() -> list[Asset]:
+    return [
         Asset("Conservative", 0.04, 0.06),
         Asset("Balanced", 0.06, 0.10),
         Asset("Growth", 0.08, 0.16),
@@ -570,16 +1492,64 @@ def compare_withdrawal_portfolios(
     portfolios: list[Asset],
     scenario: WithdrawalScenario,
     simulations: int,
+    engine: str = "python",
+    rng: random.Random | np.random.Generator | None = None,
+    keep_paths: bool = True,
+    streams: SimulationStreams | int | None = None,
+    max_workers: int | None = None,
+    chunk_size: int | None = None,
+    cache: SimulationCache | None = None,
+    variance_reduction: str | None = None,
 ) -> list[dict]:
-    comparison = []
-
+    # Every (portfolio, chunk) pair draws from its own stream, so the results
+    # depend on the seed and chunk_size but not on max_workers or portfolio order.
+    if cache is not None and streams is None:
+        raise ValueError("Caching simulations needs streams to identify the draws.")
+    if rng is not None and (
+        streams is not None or max_workers is not None or chunk_size is not None
+    ):
+        raise ValueError(
+            "rng is only used for a single in-process run. Keyed chunks draw "
+            "from streams, so pass streams (or a seed) instead."
+        )
+    validate_chunk_size(chunk_size)
     for portfolio in portfolios:
-        results = run_withdrawal_monte_carlo(
-            asset=portfolio,
+        validate_control_variate_source(portfolio, variance_reduction)
+
+    if streams is None and max_workers is None and chunk_size is None:
+        portfolio_results = [
+            run_withdrawal_monte_carlo(
+                asset=portfolio,
+                scenario=scenario,
+                simulations=simulations,
+                engine=engine,
+                rng=rng,
+                keep_paths=keep_paths,
+                variance_reduction=variance_reduction,
+            )
+            for portfolio in portfolios
+        ]
+    else:
+        portfolio_results = run_withdrawal_chunks(
+            portfolios=portfolios,
             scenario=scenario,
             simulations=simulations,
+            engine=engine,
+            keep_paths=keep_paths,
+            streams=streams,
+            max_workers=max_workers,
+            chunk_size=chunk_size,
+            cache=cache,
+            variance_reduction=variance_reduction,
         )
-        summary = summarise_withdrawal_results(results)
+
+    comparison = []
+
+    for portfolio, results in zip(portfolios, portfolio_results):
+        control_mean = None
+        if variance_reduction == "control_variate":
+            control_mean = expected_growth_factor(portfolio, scenario.months)
+        summary = summarise_withdrawal_results(results, control_mean)
 
         comparison.append(
             {
@@ -593,6 +1563,131 @@ def compare_withdrawal_portfolios(
     return comparison
 
 
+def run_withdrawal_chunks(
+    portfolios: list[Asset],
+    scenario: WithdrawalScenario,
+    simulations: int,
+    engine: str,
+    keep_paths: bool,
+    streams: SimulationStreams | int | None,
+    max_workers: int | None,
+    chunk_size: int | None,
+    cache: SimulationCache | None = None,
+    variance_reduction: str | None = None,
+) -> list[WithdrawalResults]:
+    validate_engine(engine)
+    validate_chunk_size(chunk_size)
+
+    if streams is None:
+        streams = SimulationStreams.from_entropy()
+    elif not isinstance(streams, SimulationStreams):
+        streams = SimulationStreams(seed=streams)
+
+    chunk_size = chunk_size or simulations
+    chunk_sizes = [
+        min(chunk_size, simulations - start)
+        for start in range(0, simulations, chunk_size)
+    ]
+    jobs = [
+        (
+            portfolio,
+            scenario,
+            chunk_simulations,
+            engine,
+            streams,
+            chunk_index,
+            keep_paths,
+            cache,
+            variance_reduction,
+        )
+        for portfolio in portfolios
+        for chunk_index, chunk_simulations in enumerate(chunk_sizes)
+    ]
+
+    if max_workers is None or max_workers <= 1:
+        chunk_results = [simulate_withdrawal_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            chunk_results = list(executor.map(simulate_withdrawal_chunk, *zip(*jobs)))
+
+    return [
+        WithdrawalResults.concatenate(
+            chunk_results[index * len(chunk_sizes) : (index + 1) * len(chunk_sizes)]
+        )
+        for index in range(len(portfolios))
+    ]
+
+
+def simulate_withdrawal_chunk(
+    asset: Asset,
+    scenario: WithdrawalScenario,
+    simulations: int,
+    engine: str,
+    streams: SimulationStreams,
+    chunk_index: int,
+    keep_paths: bool,
+    cache: SimulationCache | None = None,
+    variance_reduction: str | None = None,
+) -> WithdrawalResults:
+    returns = draw_withdrawal_chunk_returns(
+        asset,
+        scenario,
+        simulations,
+        engine,
+        streams,
+        chunk_index,
+        cache,
+        variance_reduction,
+    )
+
+    return calculate_withdrawal_batch(
+        asset_name=asset.name,
+        returns=returns,
+        scenario=scenario,
+        keep_paths=keep_paths,
+    )
+
+
+def draw_withdrawal_chunk_returns(
+    asset: Asset,
+    scenario: WithdrawalScenario,
+    simulations: int,
+    engine: str,
+    streams: SimulationStreams,
+    chunk_index: int,
+    cache: SimulationCache | None = None,
+    variance_reduction: str | None = None,
+) -> np.ndarray:
+    stream_key = ("withdrawal", asset.name, chunk_index)
+
+    def build():
+        return draw_withdrawal_returns(
+            asset,
+            scenario,
+            simulations,
+            engine,
+            streams.rng(engine, *stream_key),
+            variance_reduction,
+        )
+
+    if cache is None:
+        returns = build()
+    else:
+        returns = cache.get_or_create(
+            build,
+            kind="withdrawal_returns",
+            asset=asset,
+            months=scenario.months,
+            simulations=simulations,
+            engine=engine,
+            variance_reduction=variance_reduction,
+            seed=streams.seed,
+            stream_key=stream_key,
+        )
+
+    return returns
+
+
 def print_withdrawal_summary(
     comparison: list[dict],
     scenario: WithdrawalScenario,
@@ -635,50 +1730,108 @@ def find_withdrawal_comparison_result(comparison: list[dict], name: str) -> dict
     raise ValueError(f"No withdrawal result found for {name}.")
 
 
-def chart_withdrawal_paths(
-    results: list[dict],
+def build_withdrawal_chart_summary(
+    results: list[dict] | WithdrawalResults,
     scenario: WithdrawalScenario,
     number_of_paths: int,
-    save_path=None,
-):
-    fig, ax = plt.subplots()
-    style_axes(fig, ax, grid=True, zero_line=False)
-
-    month_numbers = list(range(0, scenario.months + 1))
+    early_months: int = 24,
+    path_style: str = "lines",
+) -> dict:
+    validate_path_style(path_style)
+    values = withdrawal_values_matrix(results)
     selected_paths = select_early_experience_withdrawal_paths(
         results,
         number_of_paths,
-        early_months=24,
+        early_months=early_months,
     )
-    path_styles = {
-        "Highest third after 24 months": {
-            "color": COLORS["accent"],
-            "linewidth": 1.8,
-            "alpha": 0.48,
-        },
-        "Middle third after 24 months": {
-            "color": COLORS["muted_fg"],
-            "linewidth": 1.7,
-            "alpha": 0.42,
-        },
-        "Lowest third after 24 months": {
-            "color": COLORS["link"],
-            "linewidth": 1.9,
-            "alpha": 0.58,
-        },
-    }
+    density_edges = None
+    if path_style == "density":
+        upper = max(
+            np.percentile(values, 99),
+            scenario.starting_value,
+            scenario.reserve_floor,
+        )
+        density_edges = np.linspace(0, upper * 1.12, DENSITY_VALUE_BINS + 1)
+
+    chart_summary = build_path_chart_summary(
+        values,
+        sample_paths=[result["values"] for result, _ in selected_paths],
+        density_edges=density_edges,
+    )
+    chart_summary["sample_labels"] = [label for _, label in selected_paths]
+    return chart_summary
 
-    for result, label in selected_paths:
-        style = path_styles[label]
 
-        ax.plot(
-            month_numbers,
-            result["values"],
-            color=style["color"],
-            linewidth=style["linewidth"],
-            alpha=style["alpha"],
-            zorder=3,
+def chart_withdrawal_paths(
+    chart_summary: dict,
+    scenario: WithdrawalScenario,
+    save_path=None,
+    path_style: str = "lines",
+):
+    validate_path_style(path_style)
+    fig, ax = create_figure()
+    style_axes(fig, ax, grid=True, zero_line=False)
+
+    month_numbers = list(range(0, scenario.months + 1))
+
+    if path_style == "density":
+        density = chart_summary["path_density"]
+        if density is None:
+            raise ValueError("Build the chart summary with path_style 'density'.")
+        plot_path_density(ax, density, zorder=3)
+        y_max = density["value_edges"][-1]
+        any_depleted = bool(chart_summary["final_value_histogram"]["edges"][0] <= 0)
+        legend_labels = ["Share of simulated paths"]
+        legend_handles = [Patch(color=COLORS["accent"], alpha=0.6)]
+    else:
+        sample_paths = chart_summary["sample_paths"]
+        path_styles = {
+            "Highest third after 24 months": {
+                "color": COLORS["accent"],
+                "linewidth": 1.8,
+                "alpha": 0.48,
+            },
+            "Middle third after 24 months": {
+                "color": COLORS["muted_fg"],
+                "linewidth": 1.7,
+                "alpha": 0.42,
+            },
+            "Lowest third after 24 months": {
+                "color": COLORS["link"],
+                "linewidth": 1.9,
+                "alpha": 0.58,
+            },
+        }
+
+        for path, label in zip(sample_paths, chart_summary["sample_labels"]):
+            style = path_styles[label]
+
+            ax.plot(
+                month_numbers,
+                path,
+                color=style["color"],
+                linewidth=style["linewidth"],
+                alpha=style["alpha"],
+                zorder=3,
+            )
+
+        any_depleted = bool(np.any(sample_paths <= 0))
+        y_max = 1.12 * max(
+            sample_paths.max(),
+            scenario.starting_value,
+            scenario.reserve_floor,
         )
+        legend_labels = list(path_styles.keys())
+        legend_handles = [
+            Line2D(
+                [0],
+                [0],
+                color=path_styles[label]["color"],
+                linewidth=2.2,
+                alpha=0.8,
+            )
+            for label in legend_labels
+        ]
 
     ax.axhline(
         scenario.reserve_floor,
@@ -698,7 +1851,7 @@ def chart_withdrawal_paths(
         fontsize=10,
     )
 
-    if any(result["depleted"] for result, _ in selected_paths):
+    if any_depleted:
         ax.axhline(
             0,
             color=COLORS["border"],
@@ -707,29 +1860,12 @@ def chart_withdrawal_paths(
             zorder=2,
         )
 
-    all_values = [
-        value
-        for result, _ in selected_paths
-        for value in result["values"]
-    ]
-    upper = max(all_values + [scenario.starting_value, scenario.reserve_floor])
-    ax.set_ylim(0, upper * 1.12)
+    ax.set_ylim(0, y_max)
 
     ax.set_title("Early Returns Matter When Withdrawals Continue")
     ax.set_xlabel("Month")
     ax.set_ylabel("Portfolio value ($)")
 
-    legend_labels = list(path_styles.keys())
-    legend_handles = [
-        plt.Line2D(
-            [0],
-            [0],
-            color=path_styles[label]["color"],
-            linewidth=2.2,
-            alpha=0.8,
-        )
-        for label in legend_labels
-    ]
     ax.legend(
         legend_handles,
         legend_labels,
@@ -740,70 +1876,108 @@ def chart_withdrawal_paths(
     apply_month_ticks(ax, scenario.months)
     apply_compact_currency_axis(ax)
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
 
-    plt.show()
+    return fig
+
+
+def validate_path_style(path_style: str):
+    if path_style not in PATH_STYLES:
+        raise ValueError(
+            f"Unknown path style {path_style!r}. Use one of: {', '.join(PATH_STYLES)}."
+        )
 
 
 def select_early_experience_withdrawal_paths(
-    results: list[dict],
+    results: list[dict] | WithdrawalResults,
     number_of_paths: int,
     early_months: int,
 ) -> list[tuple[dict, str]]:
-    buckets = classify_by_early_return_experience(results, early_months)
+    early_returns = calculate_early_cumulative_returns(results, early_months)
+    buckets = classify_by_early_return_experience(
+        results,
+        early_months,
+        early_returns=early_returns,
+    )
     base_count = max(1, number_of_paths // len(buckets))
     selected = []
 
     for label, bucket in buckets.items():
-        selected.extend((result, label) for result in spread_select(bucket, base_count))
+        selected.extend(
+            (index, label)
+            for index in spread_select_ranked(bucket, -early_returns[bucket], base_count)
+        )
 
     remaining = number_of_paths - len(selected)
     if remaining > 0:
-        already_selected_ids = {id(result) for result, _ in selected}
+        already_selected = np.zeros(len(early_returns), dtype=bool)
+        already_selected[[index for index, _ in selected]] = True
 
         for label, bucket in buckets.items():
-            for result in bucket:
-                if id(result) in already_selected_ids:
-                    continue
-                selected.append((result, label))
-                already_selected_ids.add(id(result))
-                if len(selected) == number_of_paths:
-                    break
-            if len(selected) == number_of_paths:
+            candidates = bucket[~already_selected[bucket]]
+            count = min(remaining, len(candidates))
+            if count == 0:
+                continue
+
+            best = candidates[np.argpartition(-early_returns[candidates], count - 1)[:count]]
+            best = best[np.argsort(-early_returns[best], kind="stable")]
+            selected.extend((index, label) for index in best)
+            remaining -= count
+            if remaining == 0:
                 break
 
-    return selected[:number_of_paths]
+    return [
+        (results[int(index)], label)
+        for index, label in selected[:number_of_paths]
+    ]
 
 
 def classify_by_early_return_experience(
-    results: list[dict],
+    results: list[dict] | WithdrawalResults,
     early_months: int,
-) -> dict[str, list[dict]]:
-    early_months = min(early_months, len(results[0]["returns"]))
-    sorted_results = sorted(
-        results,
-        key=lambda result: cumulative_return(result["returns"][:early_months]),
-        reverse=True,
-    )
-    bucket_size = len(sorted_results) // 3
+    early_returns: np.ndarray | None = None,
+) -> dict[str, np.ndarray]:
+    if early_returns is None:
+        early_returns = calculate_early_cumulative_returns(results, early_months)
+
+    bucket_size = len(early_returns) // 3
+    order = np.argpartition(-early_returns, [bucket_size, bucket_size * 2])
 
     return {
-        "Highest third after 24 months": sorted_results[:bucket_size],
-        "Middle third after 24 months": sorted_results[bucket_size : bucket_size * 2],
-        "Lowest third after 24 months": sorted_results[bucket_size * 2 :],
+        "Highest third after 24 months": order[:bucket_size],
+        "Middle third after 24 months": order[bucket_size : bucket_size * 2],
+        "Lowest third after 24 months": order[bucket_size * 2 :],
     }
 
 
-def cumulative_return(returns: list[float]) -> float:
-    cumulative_value = 1
+def calculate_early_cumulative_returns(
+    results: list[dict] | WithdrawalResults,
+    early_months: int,
+) -> np.ndarray:
+    returns = withdrawal_returns_matrix(results)
+    early_months = min(early_months, returns.shape[1])
+    return np.prod(1 + returns[:, :early_months], axis=1) - 1
+
 
-    for period_return in returns:
-        cumulative_value *= 1 + period_return
+def withdrawal_values_matrix(results: list[dict] | WithdrawalResults) -> np.ndarray:
+    if isinstance(results, WithdrawalResults):
+        if results.values is None:
+            raise ValueError("Withdrawal results were created without keep_paths.")
+        return results.values
+
+    return np.array([result["values"] for result in results], dtype=np.float64)
 
-    return cumulative_value - 1
+
+def withdrawal_returns_matrix(results: list[dict] | WithdrawalResults) -> np.ndarray:
+    if isinstance(results, WithdrawalResults):
+        if results.returns is None:
+            raise ValueError("Withdrawal results were created without keep_paths.")
+        return results.returns
+
+    return np.array([result["returns"] for result in results], dtype=np.float64)
 
 
 def spread_select(values: list, count: int) -> list:
@@ -816,22 +1990,47 @@ def spread_select(values: list, count: int) -> list:
     return [values[round(index * step)] for index in range(count)]
 
 
+def spread_select_ranked(indices: np.ndarray, scores: np.ndarray, count: int) -> np.ndarray:
+    if count >= len(indices):
+        return indices[np.argsort(scores, kind="stable")]
+    if count <= 1:
+        positions = [len(indices) // 2]
+    else:
+        step = (len(indices) - 1) / (count - 1)
+        positions = [round(index * step) for index in range(count)]
+
+    order = np.argpartition(scores, positions)
+    return indices[order[positions]]
+
+
+def calculate_first_breach_months(
+    results: list[dict] | WithdrawalResults,
+    reserve_floor: float,
+) -> np.ndarray:
+    # -1 when a path never breaches the floor.
+    if isinstance(results, WithdrawalResults):
+        values = results.column("values")
+    else:
+        values = np.asarray([result["values"] for result in results], dtype=np.float64)
+    below_floor = values < reserve_floor
+
+    return np.where(below_floor.any(axis=1), below_floor.argmax(axis=1), -1)
+
+
 def calculate_cumulative_breach_probabilities(
     results: list[dict],
     scenario: WithdrawalScenario,
 ) -> list[float]:
-    probabilities = []
-
-    for month in range(scenario.months + 1):
-        breached_count = 0
-
-        for result in results:
-            if min(result["values"][: month + 1]) < scenario.reserve_floor:
-                breached_count += 1
-
-        probabilities.append(breached_count / len(results) * 100)
+    first_breach_months = calculate_first_breach_months(
+        results,
+        scenario.reserve_floor,
+    )
+    breach_counts = np.bincount(
+        first_breach_months[first_breach_months >= 0],
+        minlength=scenario.months + 1,
+    )
 
-    return probabilities
+    return (np.cumsum(breach_counts) / len(results) * 100).tolist()
 
 
 def chart_cumulative_reserve_floor_breach_probability(
@@ -845,7 +2044,7 @@ def chart_cumulative_reserve_floor_breach_probability(
         scenario,
     )
 
-    fig, ax = plt.subplots()
+    fig, ax = create_figure()
     style_axes(fig, ax, grid=True, zero_line=False)
 
     ax.plot(
@@ -897,12 +2096,12 @@ def chart_cumulative_reserve_floor_breach_probability(
         [str(month // 12) for month in range(0, scenario.months + 1, 12)]
     )
 
-    plt.tight_layout()
+    fig.tight_layout()
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
 
-    plt.show()
+    return fig
 
 
 def run_adaptive_withdrawal_rule_test(
@@ -911,29 +2110,36 @@ def run_adaptive_withdrawal_rule_test(
     early_months: int = 24,
     reduced_monthly_withdrawal: float = 500,
 ) -> dict:
-    buckets = classify_by_early_return_experience(results, early_months)
-    weak_start_results = buckets["Lowest third after 24 months"]
-    static_results = [
-        calculate_withdrawal_result_from_returns(
-            asset_name=result["asset"],
-            returns=result["returns"],
-            scenario=scenario,
-        )
-        for result in weak_start_results
+    early_returns = calculate_early_cumulative_returns(results, early_months)
+    buckets = classify_by_early_return_experience(
+        results,
+        early_months,
+        early_returns=early_returns,
+    )
+    weak_start_indices = buckets["Lowest third after 24 months"]
+    # Keep the weak-start paths in early-return order, so charts that break
+    # ties by position always pick the same paths.
+    weak_start_indices = weak_start_indices[
+        np.argsort(-early_returns[weak_start_indices], kind="stable")
     ]
-    adaptive_results = [
-        calculate_withdrawal_result_from_returns(
-            asset_name=result["asset"],
-            returns=result["returns"],
-            scenario=scenario,
-            reduced_monthly_withdrawal=reduced_monthly_withdrawal,
-            reduction_after_month=early_months,
-        )
-        for result in weak_start_results
+    policies = [
+        WithdrawalPolicy.fixed("Static"),
+        WithdrawalPolicy.reduced_after_month(
+            reduced_monthly_withdrawal,
+            early_months,
+            name="Adaptive",
+        ),
     ]
+    static_results, adaptive_results = evaluate_withdrawal_policies(
+        asset_name=results[0]["asset"],
+        returns=withdrawal_returns_matrix(results)[weak_start_indices],
+        scenario=scenario,
+        policies=policies,
+        keep_paths=True,
+    )
 
     return {
-        "weak_start_count": len(weak_start_results),
+        "weak_start_count": len(weak_start_indices),
         "early_months": early_months,
         "reserve_floor": scenario.reserve_floor,
         "reduced_monthly_withdrawal": reduced_monthly_withdrawal,
@@ -941,6 +2147,10 @@ def run_adaptive_withdrawal_rule_test(
         "adaptive_results": adaptive_results,
         "static_summary": summarise_withdrawal_results(static_results),
         "adaptive_summary": summarise_withdrawal_results(adaptive_results),
+        "differences": calculate_paired_policy_differences(
+            policies,
+            [static_results, adaptive_results],
+        ),
     }
 
 
@@ -1019,7 +2229,7 @@ def chart_adaptive_withdrawal_rule_test(
     )
     upper = max(all_chart_values)
 
-    fig, (path_ax, hist_ax) = plt.subplots(
+    fig, (path_ax, hist_ax) = create_figure(
         ncols=2,
         sharey=True,
         gridspec_kw={"width_ratios": [2.15, 1], "wspace": 0.04},
@@ -1094,9 +2304,9 @@ def chart_adaptive_withdrawal_rule_test(
 
     survivor_values = static_survivor_values + adaptive_survivor_values
     bins = build_histogram_bins(survivor_values, 28)
-    hist_ax.hist(
-        static_survivor_values,
-        bins=bins,
+    plot_histogram_counts(
+        hist_ax,
+        calculate_histogram(static_survivor_values, bins),
         orientation="horizontal",
         color=COLORS["link"],
         edgecolor="none",
@@ -1105,9 +2315,9 @@ def chart_adaptive_withdrawal_rule_test(
         label="Static withdrawals",
         zorder=3,
     )
-    hist_ax.hist(
-        adaptive_survivor_values,
-        bins=bins,
+    plot_histogram_counts(
+        hist_ax,
+        calculate_histogram(adaptive_survivor_values, bins),
         orientation="horizontal",
         color=COLORS["accent"],
         edgecolor="none",
@@ -1183,14 +2393,14 @@ def chart_adaptive_withdrawal_rule_test(
     )
 
     legend_handles = [
-        plt.Line2D(
+        Line2D(
             [0],
             [0],
             color=COLORS["link"],
             linewidth=2.4,
             alpha=0.8,
         ),
-        plt.Line2D(
+        Line2D(
             [0],
             [0],
             color=COLORS["accent"],
@@ -1212,20 +2422,984 @@ def chart_adaptive_withdrawal_rule_test(
     fig.subplots_adjust(left=0.08, right=0.94, top=0.88, bottom=0.20, wspace=0.04)
 
     if save_path is not None:
-        plt.savefig(save_path)
+        fig.savefig(save_path)
+
+    return fig
+
+
+# ---------------------------------------------------------------------------
+# Chart summaries
+# ---------------------------------------------------------------------------
+
+
+def build_path_chart_summary(
+    paths: np.ndarray,
+    number_of_paths: int = 0,
+    sample_paths=None,
+    final_values=None,
+    density_edges=None,
+    bin_count: int = 34,
+    percentiles=FAN_CHART_PERCENTILES,
+) -> dict:
+    paths = np.asarray(paths, dtype=np.float64)
+    if sample_paths is None:
+        sample_paths = paths[:number_of_paths]
+    if final_values is None:
+        final_values = paths[:, -1]
+
+    return {
+        "months": paths.shape[1] - 1,
+        "sample_paths": np.array(sample_paths, dtype=np.float64),
+        "bands": calculate_percentile_bands(paths, percentiles),
+        "final_value_histogram": calculate_histogram(final_values, bin_count),
+        "value_range": (float(paths.min()), float(paths.max())),
+        "path_density": (
+            None if density_edges is None else build_path_density(paths, density_edges)
+        ),
+    }
+
+
+def calculate_percentile_bands(
+    paths: np.ndarray,
+    percentiles=FAN_CHART_PERCENTILES,
+) -> dict[str, np.ndarray]:
+    bands = np.percentile(np.asarray(paths), percentiles, axis=0)
+    return {f"p{value:g}": band for value, band in zip(percentiles, bands)}
+
+
+def calculate_histogram(values, bins) -> dict:
+    counts, edges = np.histogram(np.asarray(values, dtype=np.float64), bins=bins)
+    return {"counts": counts, "edges": edges}
+
+
+def plot_histogram_counts(ax, histogram: dict, **kwargs):
+    # Each bin's left edge weighted by its count draws the same bars as the raw values.
+    edges = histogram["edges"]
+    return ax.hist(edges[:-1], bins=edges, weights=histogram["counts"], **kwargs)
 
-    plt.show()
 
+def build_path_density(
+    paths,
+    value_edges: np.ndarray,
+    chunk_size: int = 10_000,
+) -> dict:
+    # Rows are binned chunk_size paths at a time, so memory stays flat.
+    value_edges = np.asarray(value_edges, dtype=np.float64)
+    value_bins = len(value_edges) - 1
+    point_count = np.shape(paths)[1]
+    counts = np.zeros(point_count * value_bins, dtype=np.int64)
+    bin_widths = np.diff(value_edges)
+    # Evenly spaced edges are binned arithmetically rather than searched.
+    even_edges = np.allclose(bin_widths, bin_widths[0])
+
+    for start in range(0, len(paths), chunk_size):
+        chunk = np.asarray(paths[start : start + chunk_size], dtype=np.float64)
+        if even_edges:
+            bin_index = np.floor((chunk - value_edges[0]) / bin_widths[0])
+            bin_index = bin_index.astype(np.int64)
+        else:
+            bin_index = np.searchsorted(value_edges, chunk, side="right") - 1
+        bin_index[chunk == value_edges[-1]] = value_bins - 1
+        inside = (
+            (bin_index >= 0)
+            & (bin_index < value_bins)
+            & (chunk >= value_edges[0])
+            & (chunk <= value_edges[-1])
+        )
+        month_index = np.broadcast_to(np.arange(point_count), chunk.shape)
+        counts += np.bincount(
+            month_index[inside] * value_bins + bin_index[inside],
+            minlength=point_count * value_bins,
+        )
+
+    return {
+        "counts": counts.reshape(point_count, value_bins).T,
+        "value_edges": value_edges,
+    }
 
-def build_histogram_bins(values: list[float], bin_count: int) -> list[float]:
-    lower = min(values)
-    upper = max(values)
+
+def build_histogram_bins(values, bin_count: int) -> np.ndarray:
+    values = np.asarray(values, dtype=np.float64)
+    lower = values.min()
+    upper = values.max()
 
     if lower == upper:
-        return [lower - 1, upper + 1]
+        return np.array([lower - 1, upper + 1])
 
     step = (upper - lower) / bin_count
-    return [lower + step * index for index in range(bin_count + 1)]
+    return lower + step * np.arange(bin_count + 1)
+
+
+def chart_percentile_bands(
+    chart_summary: dict,
+    starting_value: float,
+    title: str = "Range of Simulated Portfolio Values",
+    save_path=None,
+):
+    return fan_chart(
+        x=np.arange(chart_summary["months"] + 1),
+        bands=chart_summary["bands"],
+        title=title,
+        xlabel="Month",
+        ylabel="Portfolio value ($)",
+        starting_value=starting_value,
+        save_path=save_path,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Streaming summaries
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class QuantileSketch:
+    # Exact until exact_limit values, then t-digest style centroids that are
+    # smaller in the tails.
+    exact_limit: int = 100_000
+    compression: float = 200
+    count: int = 0
+    minimum: float = math.inf
+    maximum: float = -math.inf
+    exact_chunks: list[np.ndarray] = field(default_factory=list)
+    means: np.ndarray | None = None
+    weights: np.ndarray | None = None
+
+    @property
+    def is_exact(self) -> bool:
+        return self.means is None
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+
+        if values.size == 0:
+            return
+
+        self.count += values.size
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+
+        if self.is_exact:
+            self.exact_chunks.append(values.copy())
+
+            if self.count <= self.exact_limit:
+                return
+
+            values = np.concatenate(self.exact_chunks)
+            self.exact_chunks = []
+            self.means = np.empty(0)
+            self.weights = np.empty(0)
+
+        self.merge_centroids(values, np.ones_like(values))
+
+    def merge_centroids(self, means: np.ndarray, weights: np.ndarray):
+        means = np.concatenate([self.means, means])
+        weights = np.concatenate([self.weights, weights])
+        order = np.argsort(means, kind="stable")
+        means = means[order]
+        weights = weights[order]
+
+        cumulative_weights = np.cumsum(weights)
+        quantiles = (cumulative_weights - weights / 2) / cumulative_weights[-1]
+        scale = np.floor(
+            self.compression * (np.arcsin(2 * quantiles - 1) / math.pi + 0.5)
+        )
+        starts = np.flatnonzero(np.r_[True, scale[1:] != scale[:-1]])
+
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def exact_values(self) -> np.ndarray:
+        if not self.exact_chunks:
+            return np.empty(0)
+
+        if len(self.exact_chunks) > 1:
+            self.exact_chunks = [np.concatenate(self.exact_chunks)]
+
+        return self.exact_chunks[0]
+
+    def quantile(self, quantile_value: float) -> float:
+        if self.count == 0:
+            raise ValueError("Cannot take a quantile of an empty sketch.")
+
+        if self.is_exact:
+            # Same nearest-rank rule as percentile().
+            index = int(quantile_value * (self.count - 1))
+            return float(np.partition(self.exact_values(), index)[index])
+
+        centres = (np.cumsum(self.weights) - self.weights / 2) / self.count
+        return float(
+            np.interp(
+                quantile_value,
+                np.r_[0.0, centres, 1.0],
+                np.r_[self.minimum, self.means, self.maximum],
+            )
+        )
+
+    def median(self) -> float:
+        if self.is_exact:
+            return float(np.median(self.exact_values()))
+
+        return self.quantile(0.5)
+
+
+@dataclass
+class StreamingFinalValueSummary:
+    starting_value: float
+    exact_limit: int = 100_000
+    count: int = 0
+    total: float = 0.0
+    loss_count: int = 0
+    sketch: QuantileSketch = field(init=False)
+
+    def __post_init__(self):
+        self.sketch = QuantileSketch(exact_limit=self.exact_limit)
+
+    def update(self, final_values):
+        final_values = np.asarray(final_values, dtype=np.float64).ravel()
+
+        self.count += final_values.size
+        self.total += float(final_values.sum())
+        self.loss_count += int(np.count_nonzero(final_values < self.starting_value))
+        self.sketch.update(final_values)
+
+    def summary(self) -> dict:
+        return {
+            "mean": self.total / self.count,
+            "median": self.sketch.median(),
+            "loss_probability": self.loss_count / self.count,
+            "p5": self.sketch.quantile(0.05),
+            "p95": self.sketch.quantile(0.95),
+        }
+
+
+@dataclass
+class StreamingWithdrawalSummary:
+    months: int
+    exact_limit: int = 100_000
+    count: int = 0
+    reserve_breach_count: int = 0
+    breached_not_depleted_count: int = 0
+    depleted_count: int = 0
+    final_values: QuantileSketch = field(init=False)
+    depletion_month_counts: np.ndarray = field(init=False)
+
+    def __post_init__(self):
+        self.final_values = QuantileSketch(exact_limit=self.exact_limit)
+        self.depletion_month_counts = np.zeros(self.months + 1, dtype=np.int64)
+
+    def update(
+        self,
+        final_values,
+        breached_reserve_floor,
+        depleted,
+        first_depletion_month,
+    ):
+        breached_reserve_floor = np.asarray(breached_reserve_floor, dtype=bool)
+        depleted = np.asarray(depleted, dtype=bool)
+        first_depletion_month = np.asarray(first_depletion_month, dtype=np.int64)
+
+        self.count += depleted.size
+        self.reserve_breach_count += int(np.count_nonzero(breached_reserve_floor))
+        self.breached_not_depleted_count += int(
+            np.count_nonzero(breached_reserve_floor & ~depleted)
+        )
+        self.depleted_count += int(np.count_nonzero(depleted))
+        self.depletion_month_counts += np.bincount(
+            first_depletion_month[first_depletion_month >= 0],
+            minlength=self.months + 1,
+        )
+        self.final_values.update(final_values)
+
+    def update_from_results(self, results: list[dict]):
+        self.update(
+            final_values=[result["final_value"] for result in results],
+            breached_reserve_floor=[
+                result["breached_reserve_floor"] for result in results
+            ],
+            depleted=[result["depleted"] for result in results],
+            first_depletion_month=[
+                -1
+                if result["first_depletion_month"] is None
+                else result["first_depletion_month"]
+                for result in results
+            ],
+        )
+
+    def summary(self) -> dict:
+        depletion_months = int(self.depletion_month_counts.sum())
+
+        if depletion_months:
+            median_depletion_month = median_from_counts(self.depletion_month_counts)
+            average_depletion_month = float(
+                np.dot(np.arange(self.months + 1), self.depletion_month_counts)
+                / depletion_months
+            )
+        else:
+            median_depletion_month = None
+            average_depletion_month = None
+
+        return {
+            "funding_success_probability": (self.count - self.depleted_count)
+            / self.count,
+            "reserve_success_probability": (self.count - self.reserve_breach_count)
+            / self.count,
+            "reserve_breach_probability": self.reserve_breach_count / self.count,
+            "breached_not_depleted_probability": self.breached_not_depleted_count
+            / self.count,
+            "depletion_probability": self.depleted_count / self.count,
+            "median_final_value": self.final_values.median(),
+            "p5_final_value": self.final_values.quantile(0.05),
+            "p95_final_value": self.final_values.quantile(0.95),
+            "median_depletion_month": median_depletion_month,
+            "average_depletion_month": average_depletion_month,
+        }
+
+
+def median_from_counts(counts: np.ndarray) -> float:
+    cumulative_counts = np.cumsum(counts)
+    total = int(cumulative_counts[-1])
+    lower = int(np.searchsorted(cumulative_counts, (total - 1) // 2, side="right"))
+    upper = int(np.searchsorted(cumulative_counts, total // 2, side="right"))
+
+    if lower == upper:
+        return lower
+
+    return (lower + upper) / 2
+
+
+# ---------------------------------------------------------------------------
+# Adaptive simulation counts
+# ---------------------------------------------------------------------------
+
+
+def quantile_from_counts(counts: np.ndarray, quantile_value: float) -> int:
+    # Nearest-rank, the same rule as percentile().
+    cumulative_counts = np.cumsum(counts)
+    index = int(quantile_value * (int(cumulative_counts[-1]) - 1))
+    return int(np.searchsorted(cumulative_counts, index, side="right"))
+
+
+def wilson_interval(successes: int, count: int, z: float) -> tuple[float, float]:
+    proportion = successes / count
+    denominator = 1 + z**2 / count
+    centre = (proportion + z**2 / (2 * count)) / denominator
+    half_width = (
+        z
+        * math.sqrt(proportion * (1 - proportion) / count + z**2 / (4 * count**2))
+        / denominator
+    )
+    return max(0.0, centre - half_width), min(1.0, centre + half_width)
+
+
+def quantile_interval(quantile, quantile_value: float, count: int, z: float) -> tuple:
+    rank_error = z * math.sqrt(quantile_value * (1 - quantile_value) / count)
+    return (
+        quantile(max(0.0, quantile_value - rank_error)),
+        quantile(min(1.0, quantile_value + rank_error)),
+    )
+
+
+def calculate_withdrawal_confidence_intervals(
+    summary: StreamingWithdrawalSummary,
+    confidence: float = 0.95,
+) -> dict[str, tuple[float, float]]:
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    count = summary.count
+    intervals = {
+        "reserve_breach_probability": wilson_interval(
+            summary.reserve_breach_count,
+            count,
+            z,
+        ),
+        "breached_not_depleted_probability": wilson_interval(
+            summary.breached_not_depleted_count,
+            count,
+            z,
+        ),
+        "depletion_probability": wilson_interval(summary.depleted_count, count, z),
+    }
+    intervals["funding_success_probability"] = tuple(
+        1 - value for value in reversed(intervals["depletion_probability"])
+    )
+    intervals["reserve_success_probability"] = tuple(
+        1 - value for value in reversed(intervals["reserve_breach_probability"])
+    )
+
+    for key, quantile_value in [
+        ("median_final_value", 0.5),
+        ("p5_final_value", 0.05),
+        ("p95_final_value", 0.95),
+    ]:
+        intervals[key] = quantile_interval(
+            summary.final_values.quantile,
+            quantile_value,
+            count,
+            z,
+        )
+
+    depleted_count = int(summary.depletion_month_counts.sum())
+    if depleted_count:
+        months = np.arange(len(summary.depletion_month_counts))
+        mean_month = np.dot(months, summary.depletion_month_counts) / depleted_count
+        variance = (
+            np.dot((months - mean_month) ** 2, summary.depletion_month_counts)
+            / depleted_count
+        )
+        month_error = z * math.sqrt(variance / depleted_count)
+        intervals["average_depletion_month"] = (
+            float(mean_month - month_error),
+            float(mean_month + month_error),
+        )
+        intervals["median_depletion_month"] = quantile_interval(
+            lambda value: quantile_from_counts(summary.depletion_month_counts, value),
+            0.5,
+            depleted_count,
+            z,
+        )
+
+    return intervals
+
+
+def run_adaptive_withdrawal_monte_carlo(
+    asset: Asset,
+    scenario: WithdrawalScenario,
+    streams: SimulationStreams,
+    probability_tolerance: float = 0.01,
+    value_tolerance: float = 0.01,
+    month_tolerance: float = 3.0,
+    confidence: float = 0.95,
+    batch_size: int = 2_000,
+    min_simulations: int = 4_000,
+    max_simulations: int = 500_000,
+    engine: str = "numpy",
+    variance_reduction: str | None = None,
+) -> dict:
+    # The Wilson and order-statistic intervals assume independent paths, so
+    # antithetic pairs, Sobol points and control variates are not supported.
+    validate_variance_reduction(variance_reduction)
+    if variance_reduction is not None:
+        raise ValueError(
+            "Adaptive runs need independent draws for their confidence "
+            f"intervals, so {variance_reduction} is not supported."
+        )
+
+    tolerances = {
+        "funding_success_probability": probability_tolerance,
+        "reserve_success_probability": probability_tolerance,
+        "reserve_breach_probability": probability_tolerance,
+        "breached_not_depleted_probability": probability_tolerance,
+        "depletion_probability": probability_tolerance,
+        "median_final_value": value_tolerance * scenario.starting_value,
+        "p5_final_value": value_tolerance * scenario.starting_value,
+        "p95_final_value": value_tolerance * scenario.starting_value,
+        "median_depletion_month": month_tolerance,
+        "average_depletion_month": month_tolerance,
+    }
+    summary = StreamingWithdrawalSummary(months=scenario.months)
+    batch_index = 0
+    converged = False
+
+    while summary.count < max_simulations:
+        batch = run_withdrawal_monte_carlo(
+            asset=asset,
+            scenario=scenario,
+            simulations=min(batch_size, max_simulations - summary.count),
+            engine=engine,
+            rng=streams.rng(engine, "adaptive", asset.name, batch_index),
+            keep_paths=False,
+        )
+        summary.update(
+            final_values=batch.final_value,
+            breached_reserve_floor=batch.breached_reserve_floor,
+            depleted=batch.depleted,
+            first_depletion_month=batch.first_depletion_month,
+        )
+        batch_index += 1
+
+        if summary.count < min_simulations:
+            continue
+
+        intervals = calculate_withdrawal_confidence_intervals(summary, confidence)
+        half_widths = {key: (high - low) / 2 for key, (low, high) in intervals.items()}
+
+        if all(half_widths[key] <= tolerances[key] for key in half_widths):
+            converged = True
+            break
+
+    intervals = calculate_withdrawal_confidence_intervals(summary, confidence)
+
+    return {
+        "asset": asset.name,
+        "simulations": summary.count,
+        "converged": converged,
+        "confidence": confidence,
+        "summary": summary.summary(),
+        "confidence_intervals": intervals,
+        "tolerances": tolerances,
+    }
+
+
+def print_adaptive_withdrawal_summary(result: dict):
+    status = "converged" if result["converged"] else "stopped at the simulation limit"
+
+    print(f"\nAdaptive withdrawal simulation for {result['asset']}")
+    print(f"Simulations: {result['simulations']:,} ({status})")
+    print(f"Confidence level: {result['confidence']:.0%}")
+
+    for key, (low, high) in result["confidence_intervals"].items():
+        estimate = result["summary"][key]
+
+        if key.endswith("_probability"):
+            print(f"{key}: {estimate:.1%} ({low:.1%} to {high:.1%})")
+        elif key.endswith("_final_value"):
+            print(f"{key}: ${estimate:,.2f} (${low:,.2f} to ${high:,.2f})")
+        else:
+            print(f"{key}: {estimate:.1f} ({low:.1f} to {high:.1f})")
+
+
+# ---------------------------------------------------------------------------
+# Withdrawal scenario grid
+# ---------------------------------------------------------------------------
+
+
+def run_withdrawal_grid(
+    portfolios: list[Asset],
+    scenario: WithdrawalScenario,
+    withdrawal_rates,
+    reserve_floors,
+    simulations: int,
+    engine: str = "numpy",
+    streams: SimulationStreams | int | None = None,
+    cache: SimulationCache | None = None,
+    variance_reduction: str | None = None,
+) -> pd.DataFrame:
+    # The streams and cache keys match compare_withdrawal_portfolios(), so the
+    # same draws are reused.
+    validate_engine(engine)
+    validate_engine_variance_reduction(engine, variance_reduction)
+    if variance_reduction == "control_variate":
+        raise ValueError("The withdrawal grid does not support control variates.")
+
+    if streams is None:
+        streams = SimulationStreams.from_entropy()
+    elif not isinstance(streams, SimulationStreams):
+        streams = SimulationStreams(seed=streams)
+
+    withdrawal_rates = np.asarray(withdrawal_rates, dtype=np.float64)
+    reserve_floors = np.asarray(reserve_floors, dtype=np.float64)
+    annual_withdrawals = withdrawal_rates * scenario.starting_value
+    rows = []
+
+    for portfolio in portfolios:
+        returns = draw_withdrawal_chunk_returns(
+            portfolio,
+            scenario,
+            simulations,
+            engine,
+            streams,
+            0,
+            cache,
+            variance_reduction,
+        )
+        outcomes = calculate_withdrawal_grid_outcomes(
+            returns,
+            scenario.starting_value,
+            annual_withdrawals / 12,
+        )
+
+        depletion_probabilities = outcomes["depleted"].mean(axis=0)
+        median_final_values = np.median(outcomes["final_value"], axis=0)
+        sorted_lowest_values = np.sort(outcomes["lowest_value"], axis=0)
+
+        for column, withdrawal_rate in enumerate(withdrawal_rates):
+            breach_counts = np.searchsorted(
+                sorted_lowest_values[:, column],
+                reserve_floors,
+                side="left",
+            )
+
+            for reserve_floor, breach_count in zip(reserve_floors, breach_counts):
+                rows.append(
+                    {
+                        "portfolio": portfolio.name,
+                        "withdrawal_rate": withdrawal_rate,
+                        "annual_withdrawal": annual_withdrawals[column],
+                        "reserve_floor": reserve_floor,
+                        "funding_success_probability": 1
+                        - depletion_probabilities[column],
+                        "reserve_breach_probability": breach_count / simulations,
+                        "depletion_probability": depletion_probabilities[column],
+                        "median_final_value": median_final_values[column],
+                    }
+                )
+
+    return pd.DataFrame(rows)
+
+
+def calculate_withdrawal_grid_outcomes(
+    returns: np.ndarray,
+    starting_value: float,
+    monthly_withdrawals: np.ndarray,
+) -> dict:
+    simulations, months = returns.shape
+    monthly_withdrawals = np.asarray(monthly_withdrawals, dtype=np.float64)
+    portfolio_values = np.full(
+        (simulations, monthly_withdrawals.size),
+        starting_value,
+        dtype=np.float64,
+    )
+    lowest_values = portfolio_values.copy()
+
+    for month in range(months):
+        active = portfolio_values > 0
+        portfolio_values = np.where(
+            active,
+            portfolio_values * (1 + returns[:, month, np.newaxis]) - monthly_withdrawals,
+            portfolio_values,
+        )
+        np.maximum(portfolio_values, 0, out=portfolio_values)
+        np.minimum(lowest_values, portfolio_values, out=lowest_values)
+
+    return {
+        "final_value": portfolio_values,
+        "lowest_value": lowest_values,
+        "depleted": portfolio_values <= 0,
+    }
+
+
+def find_highest_withdrawal_rates(
+    grid: pd.DataFrame,
+    max_depletion_probability: float = 0.05,
+) -> pd.Series:
+    qualifying = grid[grid["depletion_probability"] <= max_depletion_probability]
+    return qualifying.groupby("portfolio")["withdrawal_rate"].max()
+
+
+def print_withdrawal_grid_summary(
+    grid: pd.DataFrame,
+    max_depletion_probability: float = 0.05,
+):
+    highest_rates = find_highest_withdrawal_rates(grid, max_depletion_probability)
+    rates = np.sort(grid["withdrawal_rate"].unique())
+    floors = np.sort(grid["reserve_floor"].unique())
+
+    print("\nWithdrawal rate grid")
+    print(f"Withdrawal rates: {rates[0]:.1%} to {rates[-1]:.1%} ({len(rates)} steps)")
+    print(f"Reserve floors: ${floors[0]:,.0f} to ${floors[-1]:,.0f} ({len(floors)} steps)")
+    print(
+        "Highest withdrawal rate with depletion at or below "
+        f"{max_depletion_probability:.0%}:"
+    )
+
+    for portfolio in grid["portfolio"].unique():
+        if portfolio in highest_rates:
+            print(f"{portfolio}: {highest_rates[portfolio]:.1%}")
+        else:
+            print(f"{portfolio}: none in grid")
+
+
+def chart_withdrawal_grid(
+    grid: pd.DataFrame,
+    portfolio_name: str,
+    value_column: str = "reserve_breach_probability",
+    save_path=None,
+):
+    table = grid[grid["portfolio"] == portfolio_name].pivot(
+        index="reserve_floor",
+        columns="withdrawal_rate",
+        values=value_column,
+    )
+
+    if table.empty:
+        raise ValueError(f"No withdrawal grid found for {portfolio_name}.")
+
+    return heatmap_chart(
+        x=table.columns.to_numpy() * 100,
+        y=table.index.to_numpy(),
+        values=table.to_numpy(),
+        title=f"{value_column.replace('_', ' ').capitalize()}: {portfolio_name}",
+        xlabel="Annual withdrawal rate (%)",
+        ylabel="Reserve floor",
+        y_formatter=format_compact_currency,
+        save_path=save_path,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Withdrawal policy comparison
+# ---------------------------------------------------------------------------
+
+
+def evaluate_withdrawal_policies(
+    asset_name: str,
+    returns: np.ndarray,
+    scenario: WithdrawalScenario,
+    policies: list[WithdrawalPolicy],
+    keep_paths: bool = False,
+) -> list[WithdrawalResults]:
+    simulations, months = returns.shape
+    policy_count = len(policies)
+    schedules = np.column_stack(
+        [policy.monthly_schedule(scenario)[:months] for policy in policies]
+    )
+    portfolio_rates = np.array([policy.portfolio_rate for policy in policies]) / 12
+    upper_rates = np.array(
+        [
+            np.inf if policy.guardrail_upper_rate is None else policy.guardrail_upper_rate
+            for policy in policies
+        ]
+    )
+    lower_rates = np.array(
+        [
+            0.0 if policy.guardrail_lower_rate is None else policy.guardrail_lower_rate
+            for policy in policies
+        ]
+    )
+    adjustments = np.array([policy.guardrail_adjustment for policy in policies])
+    review_months = np.array([policy.review_months for policy in policies])
+    has_guardrails = np.isfinite(upper_rates) | (lower_rates > 0)
+
+    portfolio_values = np.full(
+        (simulations, policy_count),
+        scenario.starting_value,
+        dtype=np.float64,
+    )
+    guardrail_scale = np.ones((simulations, policy_count), dtype=np.float64)
+    lowest_values = portfolio_values.copy()
+    first_depletion_month = np.full((simulations, policy_count), -1, dtype=np.int64)
+    values = None
+
+    if keep_paths:
+        values = np.empty((simulations, months + 1, policy_count), dtype=np.float64)
+        values[:, 0] = portfolio_values
+
+    if scenario.starting_value <= 0:
+        first_depletion_month[:] = 0
+
+    for month in range(1, months + 1):
+        active = portfolio_values > 0
+        reviewing = has_guardrails & ((month - 1) % review_months == 0) & (month > 1)
+
+        if reviewing.any():
+            with np.errstate(divide="ignore", invalid="ignore"):
+                withdrawal_rates = (
+                    12 * schedules[month - 1] * guardrail_scale / portfolio_values
+                )
+            guardrail_scale = np.where(
+                reviewing & active & (withdrawal_rates > upper_rates),
+                guardrail_scale * (1 - adjustments),
+                guardrail_scale,
+            )
+            guardrail_scale = np.where(
+                reviewing & active & (withdrawal_rates < lower_rates),
+                guardrail_scale * (1 + adjustments),
+                guardrail_scale,
+            )
+
+        grown_values = portfolio_values * (1 + returns[:, month - 1, np.newaxis])
+        monthly_withdrawals = (
+            schedules[month - 1] * guardrail_scale + portfolio_rates * grown_values
+        )
+        portfolio_values = np.where(
+            active,
+            grown_values - monthly_withdrawals,
+            portfolio_values,
+        )
+        np.maximum(portfolio_values, 0, out=portfolio_values)
+
+        newly_depleted = active & (portfolio_values <= 0)
+        first_depletion_month[newly_depleted] = month
+        np.minimum(lowest_values, portfolio_values, out=lowest_values)
+
+        if keep_paths:
+            values[:, month] = portfolio_values
+
+    growth_factor = np.prod(1 + returns, axis=1)
+
+    return [
+        WithdrawalResults(
+            asset=asset_name,
+            months=months,
+            final_value=portfolio_values[:, index],
+            breached_reserve_floor=lowest_values[:, index] < scenario.reserve_floor,
+            depleted=first_depletion_month[:, index] >= 0,
+            first_depletion_month=first_depletion_month[:, index],
+            returns=returns if keep_paths else None,
+            values=values[:, :, index] if keep_paths else None,
+            growth_factor=growth_factor,
+        )
+        for index in range(policy_count)
+    ]
+
+
+def calculate_paired_policy_differences(
+    policies: list[WithdrawalPolicy],
+    policy_results: list[WithdrawalResults],
+    confidence: float = 0.95,
+    baseline_index: int = 0,
+) -> pd.DataFrame:
+    # Every policy saw the same returns, so each path gives a paired difference.
+    z = statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
+    baseline = policy_results[baseline_index]
+    baseline_metrics = {
+        "depletion_probability": baseline.depleted,
+        "reserve_breach_probability": baseline.breached_reserve_floor,
+        "mean_final_value": baseline.final_value,
+    }
+    rows = []
+
+    for index, (policy, results) in enumerate(zip(policies, policy_results)):
+        if index == baseline_index:
+            continue
+
+        metrics = {
+            "depletion_probability": results.depleted,
+            "reserve_breach_probability": results.breached_reserve_floor,
+            "mean_final_value": results.final_value,
+        }
+
+        for metric, values in metrics.items():
+            differences = values.astype(np.float64) - baseline_metrics[metric]
+            difference = differences.mean()
+            margin = 0.0
+            if len(differences) > 1:
+                margin = z * differences.std(ddof=1) / math.sqrt(len(differences))
+
+            rows.append(
+                {
+                    "policy": policy.name,
+                    "baseline": policies[baseline_index].name,
+                    "metric": metric,
+                    "difference": difference,
+                    "low": difference - margin,
+                    "high": difference + margin,
+                }
+            )
+
+    return pd.DataFrame(rows)
+
+
+def compare_withdrawal_policies(
+    asset: Asset,
+    scenario: WithdrawalScenario,
+    policies: list[WithdrawalPolicy],
+    simulations: int,
+    engine: str = "numpy",
+    streams: SimulationStreams | int | None = None,
+    cache: SimulationCache | None = None,
+    variance_reduction: str | None = None,
+    confidence: float = 0.95,
+    keep_paths: bool = False,
+) -> dict:
+    # Common random numbers: one return matrix, drawn from the same stream and
+    # cache entry as compare_withdrawal_portfolios(), is shared by every policy.
+    validate_engine(engine)
+    validate_engine_variance_reduction(engine, variance_reduction)
+    if variance_reduction == "control_variate":
+        raise ValueError("The policy comparison does not support control variates.")
+
+    if streams is None:
+        streams = SimulationStreams.from_entropy()
+    elif not isinstance(streams, SimulationStreams):
+        streams = SimulationStreams(seed=streams)
+
+    returns = draw_withdrawal_chunk_returns(
+        asset,
+        scenario,
+        simulations,
+        engine,
+        streams,
+        0,
+        cache,
+        variance_reduction,
+    )
+    policy_results = evaluate_withdrawal_policies(
+        asset.name,
+        returns,
+        scenario,
+        policies,
+        keep_paths=keep_paths,
+    )
+
+    return {
+        "asset": asset,
+        "policies": policies,
+        "results": policy_results,
+        "summaries": [summarise_withdrawal_results(results) for results in policy_results],
+        "differences": calculate_paired_policy_differences(
+            policies,
+            policy_results,
+            confidence,
+        ),
+        "confidence": confidence,
+    }
+
+
+def print_withdrawal_policy_comparison(comparison: dict):
+    print(f"\nWithdrawal policy comparison: {comparison['asset'].name}")
+    print("Every policy is run on the same simulated returns.")
+
+    for policy, summary in zip(comparison["policies"], comparison["summaries"]):
+        print(
+            f"{policy.name}: depletion {summary['depletion_probability']:.1%}, "
+            f"reserve breach {summary['reserve_breach_probability']:.1%}, "
+            f"median final value ${summary['median_final_value']:,.0f}"
+        )
+
+    print(f"\nPaired differences ({comparison['confidence']:.0%} confidence intervals)")
+
+    for row in comparison["differences"].itertuples():
+        if row.metric.endswith("_probability"):
+            print(
+                f"{row.policy} vs {row.baseline}, {row.metric}: "
+                f"{row.difference:+.1%} ({row.low:+.1%} to {row.high:+.1%})"
+            )
+        else:
+            print(
+                f"{row.policy} vs {row.baseline}, {row.metric}: "
+                f"${row.difference:+,.0f} (${row.low:+,.0f} to ${row.high:+,.0f})"
+            )
+
+
+# ---------------------------------------------------------------------------
+# Chart rendering
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ChartJob:
+    # Module-level chart functions only, so a job can be sent to a worker process.
+    chart: object
+    save_path: Path
+    kwargs: dict = field(default_factory=dict)
+
+
+def render_chart_job(job: ChartJob, rc_params: dict | None = None) -> Path:
+    # Workers may be fresh processes, so the chart style is set up in each.
+    setup_matplotlib_style()
+    if rc_params:
+        matplotlib.rcParams.update(rc_params)
+
+    job.chart(save_path=job.save_path, **job.kwargs)
+    return job.save_path
+
+
+def render_chart_jobs(
+    jobs: list[ChartJob],
+    max_workers: int | None = None,
+    rc_params: dict | None = None,
+) -> list[Path]:
+    # Charts draw on their own Figure objects, not pyplot state, so they can be
+    # rendered side by side in a process pool.
+    if max_workers is not None and max_workers <= 1:
+        return [render_chart_job(job, rc_params) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(render_chart_job, jobs, [rc_params] * len(jobs))
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -1233,10 +3407,17 @@ def build_histogram_bins(values: list[float], bin_count: int) -> list[float]:
 # ---------------------------------------------------------------------------
 
 
-def main():
+def main(engine: str = "python"):
+    # The default reproduces the published figures and printed results.
+    validate_engine(engine)
     setup_matplotlib_style()
     plt.rcParams["font.family"] = ["DejaVu Serif"]
     random.seed(7)
+    streams = None
+    cache = None
+    if engine == "numpy":
+        streams = SimulationStreams(seed=7)
+        cache = SimulationCache()
 
     output_dir = Path("outputs")
     output_dir.mkdir(exist_ok=True)
@@ -1254,37 +3435,72 @@ def main():
     growth_starting_value = 10_000
     simulations = 5_000
 
-    asset_verification = verify_asset_return_model(growth_asset)
+    asset_verification = verify_asset_return_model(
+        growth_asset,
+        rng=None if streams is None else streams.python_random("verification"),
+    )
     print_asset_return_model_verification(asset_verification)
 
-    chart_coin_toss_example(save_path=saved_chart_paths[0])
+    # Drawn here rather than in the chart job, which may run in another process.
+    coin_toss_results = coin_toss_simulation(
+        300,
+        None if streams is None else streams.python_random("coin_toss"),
+    )
+    chart_jobs = [
+        ChartJob(
+            chart_coin_toss_example,
+            saved_chart_paths[0],
+            {"results": coin_toss_results},
+        )
+    ]
 
     growth_results = run_horizon_analysis(
         asset=growth_asset,
         horizons_months=horizons_months,
         starting_value=growth_starting_value,
         simulations=simulations,
+        engine=engine,
+        streams=streams,
+        cache=cache,
+        path_retention="sample",
+        sampled_paths=20,
+        path_horizons=[120],
+        chunk_size=1_000,
     )
     print_horizon_summary(growth_results)
-
-    chart_simulated_paths(
+    print_simulated_path_summary(
         results=growth_results,
         horizon_months=120,
-        number_of_paths=20,
         starting_value=growth_starting_value,
         expected_annual_return=growth_asset.annual_return,
-        save_path=saved_chart_paths[1],
-    )
-    chart_loss_probability_by_horizon(
-        growth_results,
-        save_path=saved_chart_paths[2],
-    )
-    chart_percentile_range_by_horizon(
-        growth_results,
-        growth_starting_value,
-        save_path=saved_chart_paths[3],
     )
 
+    chart_jobs += [
+        ChartJob(
+            chart_simulated_paths,
+            saved_chart_paths[1],
+            {
+                "chart_summary": build_horizon_chart_summary(
+                    growth_results,
+                    horizon_months=120,
+                    number_of_paths=20,
+                ),
+                "starting_value": growth_starting_value,
+                "expected_annual_return": growth_asset.annual_return,
+            },
+        ),
+        ChartJob(
+            chart_loss_probability_by_horizon,
+            saved_chart_paths[2],
+            {"results": growth_results},
+        ),
+        ChartJob(
+            chart_percentile_range_by_horizon,
+            saved_chart_paths[3],
+            {"results": growth_results, "starting_value": growth_starting_value},
+        ),
+    ]
+
     withdrawal_scenario = WithdrawalScenario(
         starting_value=100_000,
         annual_withdrawal=8_000,
@@ -1296,6 +3512,9 @@ def main():
         portfolios=withdrawal_portfolios,
         scenario=withdrawal_scenario,
         simulations=simulations,
+        engine=engine,
+        streams=streams,
+        cache=cache,
     )
     print_withdrawal_summary(
         comparison=withdrawal_comparison,
@@ -1307,11 +3526,19 @@ def main():
         withdrawal_comparison,
         "Balanced",
     )
-    chart_withdrawal_paths(
-        results=balanced_withdrawal_result["results"],
-        scenario=withdrawal_scenario,
-        number_of_paths=24,
-        save_path=saved_chart_paths[4],
+    chart_jobs.append(
+        ChartJob(
+            chart_withdrawal_paths,
+            saved_chart_paths[4],
+            {
+                "chart_summary": build_withdrawal_chart_summary(
+                    balanced_withdrawal_result["results"],
+                    withdrawal_scenario,
+                    number_of_paths=24,
+                ),
+                "scenario": withdrawal_scenario,
+            },
+        )
     )
     adaptive_rule_test = run_adaptive_withdrawal_rule_test(
         results=balanced_withdrawal_result["results"],
@@ -1320,12 +3547,16 @@ def main():
         reduced_monthly_withdrawal=500,
     )
     print_adaptive_withdrawal_rule_test(adaptive_rule_test)
-    chart_adaptive_withdrawal_rule_test(
-        result=adaptive_rule_test,
-        number_of_paths=28,
-        save_path=saved_chart_paths[5],
+    chart_jobs.append(
+        ChartJob(
+            chart_adaptive_withdrawal_rule_test,
+            saved_chart_paths[5],
+            {"result": adaptive_rule_test, "number_of_paths": 28},
+        )
     )
 
+    render_chart_jobs(chart_jobs, rc_params={"font.family": ["DejaVu Serif"]})
+
     print("\nSaved chart files")
     for chart_path in saved_chart_paths:
         print(chart_path)
@@ -0,0 +1,409 @@
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# Each model can be passed to the simulation and withdrawal runners in place
+# of an Asset when using the numpy engine. Like Asset, it has a name, a
+# monthly_return used for expected-growth calculations, and a sample_returns
+# method that draws a (simulations, months) matrix of monthly returns.
+
+
+@dataclass
+class StudentTReturns:
+    name: str
+    monthly_return: float
+    monthly_volatility: float
+    degrees_of_freedom: float = 5
+
+    def __post_init__(self):
+        if self.degrees_of_freedom <= 2:
+            raise ValueError("Student-t returns need more than 2 degrees of freedom.")
+
+    @classmethod
+    def from_asset(cls, asset, degrees_of_freedom: float = 5) -> "StudentTReturns":
+        return cls(
+            name=asset.name,
+            monthly_return=asset.monthly_return,
+            monthly_volatility=asset.monthly_volatility,
+            degrees_of_freedom=degrees_of_freedom,
+        )
+
+    def sample_returns(
+        self,
+        rng: np.random.Generator,
+        simulations: int,
+        months: int,
+    ) -> np.ndarray:
+        # Rescale so the volatility matches a normal asset with the same inputs.
+        scale = math.sqrt((self.degrees_of_freedom - 2) / self.degrees_of_freedom)
+        shocks = rng.standard_t(self.degrees_of_freedom, size=(simulations, months))
+        return self.monthly_return + self.monthly_volatility * scale * shocks
+
+
+@dataclass
+class GarchReturns:
+    # GARCH(1,1): variance_t = omega + alpha * shock_{t-1}^2 + beta * variance_{t-1}.
+    # omega is set so the long-run volatility equals monthly_volatility.
+    name: str
+    monthly_return: float
+    monthly_volatility: float
+    alpha: float = 0.08
+    beta: float = 0.90
+    degrees_of_freedom: float | None = None
+
+    def __post_init__(self):
+        if self.alpha < 0 or self.beta < 0 or self.alpha + self.beta >= 1:
+            raise ValueError("GARCH returns need alpha, beta >= 0 and alpha + beta < 1.")
+
+    @classmethod
+    def from_asset(
+        cls,
+        asset,
+        alpha: float = 0.08,
+        beta: float = 0.90,
+        degrees_of_freedom: float | None = None,
+    ) -> "GarchReturns":
+        return cls(
+            name=asset.name,
+            monthly_return=asset.monthly_return,
+            monthly_volatility=asset.monthly_volatility,
+            alpha=alpha,
+            beta=beta,
+            degrees_of_freedom=degrees_of_freedom,
+        )
+
+    @property
+    def omega(self) -> float:
+        return self.monthly_volatility**2 * (1 - self.alpha - self.beta)
+
+    def sample_returns(
+        self,
+        rng: np.random.Generator,
+        simulations: int,
+        months: int,
+    ) -> np.ndarray:
+        if self.degrees_of_freedom is None:
+            innovations = rng.standard_normal((simulations, months))
+        else:
+            innovations = rng.standard_t(
+                self.degrees_of_freedom,
+                size=(simulations, months),
+            ) * math.sqrt((self.degrees_of_freedom - 2) / self.degrees_of_freedom)
+
+        returns = np.empty((simulations, months), dtype=np.float64)
+        variance = np.full(simulations, self.monthly_volatility**2)
+
+        # The recursion runs over months; each step covers every path at once.
+        for month in range(months):
+            shocks = np.sqrt(variance) * innovations[:, month]
+            returns[:, month] = self.monthly_return + shocks
+            variance = self.omega + self.alpha * shocks**2 + self.beta * variance
+
+        return returns
+
+
+@dataclass
+class RegimeSwitchingReturns:
+    # Two-state Markov chain, for example a calm and a stressed market. Each
+    # month a path stays in its regime with that regime's stay probability.
+    name: str
+    regime_returns: tuple[float, float] = (0.009, -0.01)
+    regime_volatilities: tuple[float, float] = (0.035, 0.08)
+    stay_probabilities: tuple[float, float] = (0.97, 0.85)
+
+    @property
+    def stationary_probabilities(self) -> np.ndarray:
+        leave_calm = 1 - self.stay_probabilities[0]
+        leave_stressed = 1 - self.stay_probabilities[1]
+        calm_share = leave_stressed / (leave_calm + leave_stressed)
+        return np.array([calm_share, 1 - calm_share])
+
+    @property
+    def monthly_return(self) -> float:
+        return float(np.dot(self.stationary_probabilities, self.regime_returns))
+
+    def sample_returns(
+        self,
+        rng: np.random.Generator,
+        simulations: int,
+        months: int,
+    ) -> np.ndarray:
+        regime_returns = np.asarray(self.regime_returns)
+        regime_volatilities = np.asarray(self.regime_volatilities)
+        stay_probabilities = np.asarray(self.stay_probabilities)
+
+        # Paths start from the long-run regime mix rather than all calm.
+        regimes = (
+            rng.random(simulations) < self.stationary_probabilities[1]
+        ).astype(np.intp)
+        switch_draws = rng.random((simulations, months))
+        shocks = rng.standard_normal((simulations, months))
+        returns = np.empty((simulations, months), dtype=np.float64)
+
+        for month in range(months):
+            returns[:, month] = (
+                regime_returns[regimes]
+                + regime_volatilities[regimes] * shocks[:, month]
+            )
+            switching = switch_draws[:, month] >= stay_probabilities[regimes]
+            regimes = np.where(switching, 1 - regimes, regimes)
+
+        return returns
+
+
+@dataclass
+class BlockBootstrapReturns:
+    # Resamples blocks of consecutive historical months, wrapping around the
+    # end of the history, so short-run autocorrelation and fat tails in the
+    # data carry through to the simulated paths.
+    name: str
+    history: np.ndarray
+    block_length: int = 6
+
+    def __post_init__(self):
+        self.history = np.asarray(self.history, dtype=np.float64).ravel()
+
+        if self.history.size == 0:
+            raise ValueError("Block bootstrap needs at least one historical return.")
+        if self.block_length < 1:
+            raise ValueError("Block length must be at least one month.")
+
+    @classmethod
+    def from_csv(
+        cls,
+        path: str | Path,
+        column: str = "fund",
+        fund_name: str | None = None,
+        block_length: int = 6,
+        name: str | None = None,
+    ) -> "BlockBootstrapReturns":
+        # Reads monthly returns in the t7 layout (date, fund_name, fund,
+        # benchmark). A file holding several funds needs fund_name, so each
+        # block is consecutive months of one fund rather than one month of
+        # several funds.
+        df = pd.read_csv(path, parse_dates=["date"])
+
+        if "fund_name" in df.columns:
+            if fund_name is not None:
+                df = df[df["fund_name"] == fund_name]
+            elif df["fund_name"].nunique() > 1:
+                funds = ", ".join(sorted(df["fund_name"].unique()))
+                raise ValueError(
+                    f"{path} holds returns for several funds ({funds}). "
+                    "Pass fund_name to bootstrap one of them."
+                )
+            df = df.sort_values(["fund_name", "date"], kind="stable")
+        elif fund_name is not None:
+            raise ValueError(f"{path} has no fund_name column to filter on.")
+        else:
+            df = df.sort_values("date", kind="stable")
+
+        if df.empty:
+            raise ValueError(f"No returns found in {path} for {fund_name or column}.")
+
+        return cls(
+            name=name or fund_name or column,
+            history=df[column].to_numpy(dtype=np.float64),
+            block_length=block_length,
+        )
+
+    @property
+    def monthly_return(self) -> float:
+        return float(self.history.mean())
+
+    def sample_returns(
+        self,
+        rng: np.random.Generator,
+        simulations: int,
+        months: int,
+    ) -> np.ndarray:
+        blocks = math.ceil(months / self.block_length)
+        starts = rng.integers(0, self.history.size, size=(simulations, blocks, 1))
+        offsets = np.arange(self.block_length)
+        indices = (starts + offsets).reshape(simulations, -1)[:, :months]
+        return self.history[indices % self.history.size]
+
+
+@dataclass
+class CorrelatedPortfolioReturns:
+    # Several correlated holdings combined into one portfolio return stream.
+    # The Cholesky factor of the monthly covariance is computed once, then each
+    # month draws every path and every holding in one matrix product. Weights
+    # drift with performance and are reset to target every rebalance_months
+    # (None means buy and hold).
+    name: str
+    holdings: list[str]
+    monthly_returns: np.ndarray
+    covariance: np.ndarray
+    weights: dict[str, float]
+    rebalance_months: int | None = 12
+    cholesky_factor: np.ndarray = field(init=False, repr=False, compare=False)
+    target_weights: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.holdings = list(self.holdings)
+        self.monthly_returns = np.asarray(self.monthly_returns, dtype=np.float64)
+        self.covariance = np.asarray(self.covariance, dtype=np.float64)
+
+        missing = sorted(set(self.weights) - set(self.holdings))
+        if missing:
+            raise ValueError(f"Weights given for unknown holdings: {', '.join(missing)}.")
+
+        self.target_weights = np.array(
+            [self.weights.get(holding, 0.0) for holding in self.holdings],
+            dtype=np.float64,
+        )
+        if not math.isclose(self.target_weights.sum(), 1.0, abs_tol=1e-6):
+            raise ValueError(
+                f"Portfolio weights must sum to 1, got {self.target_weights.sum():.4f}."
+            )
+
+        try:
+            self.cholesky_factor = np.linalg.cholesky(self.covariance)
+        except np.linalg.LinAlgError as error:
+            raise ValueError("Covariance matrix must be positive definite.") from error
+
+    @classmethod
+    def from_assets(
+        cls,
+        name: str,
+        assets: dict[str, object],
+        correlation,
+        weights: dict[str, float],
+        rebalance_months: int | None = 12,
+    ) -> "CorrelatedPortfolioReturns":
+        holdings = list(assets)
+        volatilities = np.array([assets[holding].monthly_volatility for holding in holdings])
+        covariance = np.asarray(correlation) * np.outer(volatilities, volatilities)
+
+        return cls(
+            name=name,
+            holdings=holdings,
+            monthly_returns=np.array(
+                [assets[holding].monthly_return for holding in holdings]
+            ),
+            covariance=covariance,
+            weights=weights,
+            rebalance_months=rebalance_months,
+        )
+
+    @classmethod
+    def from_return_table(
+        cls,
+        name: str,
+        returns: pd.DataFrame,
+        weights: dict[str, float],
+        rebalance_months: int | None = 12,
+        shrinkage: float | None = None,
+    ) -> "CorrelatedPortfolioReturns":
+        # returns has one column of monthly returns per holding, such as the
+        # t9 return table for the WEIGHTS and REVISED_WEIGHTS tickers. The
+        # covariance is shrunk with shrink_covariance(); shrinkage=None
+        # estimates the intensity from the data.
+        returns = returns[list(weights)].dropna()
+        covariance, _ = shrink_covariance(returns.to_numpy(), shrinkage)
+
+        return cls(
+            name=name,
+            holdings=list(returns.columns),
+            monthly_returns=returns.mean().to_numpy(),
+            covariance=covariance,
+            weights=weights,
+            rebalance_months=rebalance_months,
+        )
+
+    def with_weights(
+        self,
+        weights: dict[str, float],
+        name: str | None = None,
+    ) -> "CorrelatedPortfolioReturns":
+        return CorrelatedPortfolioReturns(
+            name=name or self.name,
+            holdings=self.holdings,
+            monthly_returns=self.monthly_returns,
+            covariance=self.covariance,
+            weights=weights,
+            rebalance_months=self.rebalance_months,
+        )
+
+    @property
+    def monthly_return(self) -> float:
+        return float(np.dot(self.target_weights, self.monthly_returns))
+
+    @property
+    def monthly_volatility(self) -> float:
+        return float(
+            math.sqrt(self.target_weights @ self.covariance @ self.target_weights)
+        )
+
+    def sample_holding_returns(
+        self,
+        rng: np.random.Generator,
+        simulations: int,
+    ) -> np.ndarray:
+        shocks = rng.standard_normal((simulations, len(self.holdings)))
+        return self.monthly_returns + shocks @ self.cholesky_factor.T
+
+    def sample_returns(
+        self,
+        rng: np.random.Generator,
+        simulations: int,
+        months: int,
+    ) -> np.ndarray:
+        returns = np.empty((simulations, months), dtype=np.float64)
+        current_weights = np.tile(self.target_weights, (simulations, 1))
+
+        for month in range(months):
+            if self.rebalance_months and month and month % self.rebalance_months == 0:
+                current_weights[:] = self.target_weights
+
+            holding_returns = self.sample_holding_returns(rng, simulations)
+            portfolio_returns = np.einsum("ij,ij->i", current_weights, holding_returns)
+            returns[:, month] = portfolio_returns
+
+            # Each holding's share drifts with its return relative to the portfolio.
+            current_weights *= 1 + holding_returns
+            current_weights /= (1 + portfolio_returns)[:, np.newaxis]
+
+        return returns
+
+
+def shrink_covariance(
+    returns: np.ndarray,
+    shrinkage: float | None = None,
+) -> tuple[np.ndarray, float]:
+    # Sample covariance shrunk towards its own diagonal: variances are kept and
+    # correlations pulled towards zero. A window with no more months than
+    # holdings (six months of the six t9 tickers, say) has a singular sample
+    # covariance, which any shrinkage above zero makes positive definite.
+    # With shrinkage=None the intensity is Schafer and Strimmer's estimate for
+    # this target: the estimation noise in the off-diagonal terms relative to
+    # their size. Returns the covariance and the intensity used.
+    returns = np.asarray(returns, dtype=np.float64)
+    observations, holdings = returns.shape
+
+    if observations < 2:
+        raise ValueError("Estimating a covariance needs at least two months of returns.")
+
+    centred = returns - returns.mean(axis=0)
+    products = centred[:, :, np.newaxis] * centred[:, np.newaxis, :]
+    sample = products.sum(axis=0) / (observations - 1)
+
+    if shrinkage is None:
+        off_diagonal = ~np.eye(holdings, dtype=bool)
+        product_variance = (
+            observations
+            / (observations - 1) ** 3
+            * ((products - products.mean(axis=0)) ** 2).sum(axis=0)
+        )
+        scale = (sample[off_diagonal] ** 2).sum()
+        shrinkage = 1.0 if scale == 0 else product_variance[off_diagonal].sum() / scale
+
+    shrinkage = float(np.clip(shrinkage, 0.0, 1.0))
+    target = np.diag(np.diag(sample))
+
+    return (1 - shrinkage) * sample + shrinkage * target, shrinkage
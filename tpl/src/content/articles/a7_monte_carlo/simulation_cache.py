@@ -0,0 +1,165 @@
+import dataclasses
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+DEFAULT_CACHE_DIR = Path(".simulation_cache")
+
+# Bump when the way simulations are drawn changes, so old files are ignored.
+CACHE_VERSION = 1
+
+# Part of every key, so a NumPy upgrade or a different default bit generator
+# cannot serve arrays drawn by another generator.
+BIT_GENERATOR = type(np.random.default_rng(0).bit_generator).__name__
+
+
+def normalise_key_part(part):
+    if dataclasses.is_dataclass(part) and not isinstance(part, type):
+        return {
+            "type": type(part).__name__,
+            "fields": normalise_key_part(dataclasses.asdict(part)),
+        }
+
+    if isinstance(part, dict):
+        return {str(key): normalise_key_part(value) for key, value in part.items()}
+
+    if isinstance(part, (list, tuple)):
+        return [normalise_key_part(value) for value in part]
+
+    if isinstance(part, np.ndarray):
+        return {
+            "shape": list(part.shape),
+            "dtype": str(part.dtype),
+            "sha256": hashlib.sha256(np.ascontiguousarray(part).tobytes()).hexdigest(),
+        }
+
+    if isinstance(part, np.generic):
+        return part.item()
+
+    if isinstance(part, Path):
+        return str(part)
+
+    return part
+
+
+def build_cache_key(**parts) -> str:
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "numpy": np.__version__,
+            "bit_generator": BIT_GENERATOR,
+            "parts": normalise_key_part(parts),
+        },
+        sort_keys=True,
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SimulationCache:
+    # Content-addressed store of simulated matrices. Each array is saved as
+    # <sha256 of its inputs>.npy and loaded back memory-mapped, so a re-run
+    # with unchanged assets, scenarios, simulation counts and seeds skips the
+    # simulation entirely.
+    directory: Path = DEFAULT_CACHE_DIR
+    memory_map: bool = True
+
+    def __post_init__(self):
+        self.directory = Path(self.directory)
+
+    def path_for(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def load(self, key: str) -> np.ndarray | None:
+        path = self.path_for(key)
+
+        if not path.exists():
+            return None
+
+        try:
+            return np.load(path, mmap_mode="r" if self.memory_map else None)
+        except (OSError, ValueError):
+            # A damaged file is treated as a miss and rebuilt.
+            return None
+
+    def save(self, key: str, array) -> np.ndarray:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        temporary_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+
+        np.save(temporary_path, np.asarray(array))
+        os.replace(temporary_path, path)
+
+        # Misses are read back from the file like hits, so callers get the
+        # same array type whether or not the entry already existed.
+        return self.load(key)
+
+    def get_or_create(self, build, **key_parts) -> np.ndarray:
+        key = build_cache_key(**key_parts)
+        cached = self.load(key)
+
+        if cached is not None:
+            return cached
+
+        return self.save(key, build())
+
+    def get_or_create_chunks(self, build_chunks, shape, dtype=np.float64, **key_parts):
+        # Like get_or_create(), but build_chunks() yields row blocks that are
+        # written straight into the file, so the full matrix is never held in
+        # memory.
+        key = build_cache_key(**key_parts)
+        cached = self.load(key)
+
+        if cached is not None:
+            return cached
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        temporary_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+        shape = tuple(shape)
+        array = np.lib.format.open_memmap(
+            temporary_path,
+            mode="w+",
+            dtype=dtype,
+            shape=shape,
+        )
+
+        # Nothing is published unless build_chunks() filled every row, so a
+        # failed or short build never leaves a partial matrix behind.
+        try:
+            start = 0
+
+            for chunk in build_chunks():
+                chunk = np.asarray(chunk, dtype=dtype)
+                if start + len(chunk) > shape[0]:
+                    raise ValueError(
+                        f"build_chunks() yielded more than the {shape[0]} rows expected."
+                    )
+                array[start : start + len(chunk)] = chunk
+                start += len(chunk)
+
+            if start != shape[0]:
+                raise ValueError(
+                    f"build_chunks() yielded {start} rows, expected {shape[0]}."
+                )
+
+            array.flush()
+        except BaseException:
+            del array
+            temporary_path.unlink(missing_ok=True)
+            raise
+
+        del array
+        os.replace(temporary_path, path)
+
+        return self.load(key)
+
+    def clear(self):
+        for path in self.directory.glob("*.npy"):
+            path.unlink()
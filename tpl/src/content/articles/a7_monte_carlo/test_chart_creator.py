@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from matplotlib.figure import Figure
+from PIL import Image
+
+import chart_creator
+from chart_creator import COLORS, add_logo_watermark, bar_chart, load_logo_image
+
+
+def write_logo(path, mode):
+    gray = np.tile(np.linspace(0, 255, 16, dtype=np.uint8), (8, 1))
+    channels = {
+        "L": gray,
+        "LA": np.dstack([gray, np.full_like(gray, 128)]),
+        "RGB": np.dstack([gray, gray, gray]),
+        "RGBA": np.dstack([gray, gray, gray, np.full_like(gray, 128)]),
+    }
+    Image.fromarray(channels[mode], mode=mode).save(path)
+    return gray / 255
+
+
+@pytest.mark.parametrize("mode", ["L", "LA", "RGB", "RGBA"])
+def test_logo_is_normalised_to_rgba(tmp_path, mode):
+    logo_path = tmp_path / f"logo_{mode}.png"
+    gray = write_logo(logo_path, mode)
+
+    image = load_logo_image(logo_path)
+
+    assert image.shape == (8, 16, 4)
+    for channel in range(3):
+        np.testing.assert_allclose(image[..., channel], gray, atol=1e-6)
+    expected_alpha = 128 / 255 if "A" in mode else 1.0
+    np.testing.assert_allclose(image[..., 3], expected_alpha, atol=1e-6)
+    assert not image.flags.writeable
+
+
+def test_grayscale_logo_watermark_renders(tmp_path):
+    logo_path = tmp_path / "logo.png"
+    write_logo(logo_path, "L")
+    fig = Figure()
+    ax = fig.subplots()
+
+    add_logo_watermark(ax, logo_path=logo_path)
+    fig.savefig(tmp_path / "chart.png")
+
+    assert (tmp_path / "chart.png").stat().st_size > 0
+
+
+def test_cached_chart_is_redrawn_when_colors_or_code_change(tmp_path, monkeypatch):
+    save_path = tmp_path / "bars.png"
+
+    def render():
+        return bar_chart(["a", "b"], [1, 2], "Bars", "Category", "Value", save_path=save_path)
+
+    assert isinstance(render(), Figure)
+    assert render() is None
+
+    monkeypatch.setitem(COLORS, "accent", "#000000")
+    assert isinstance(render(), Figure)
+    assert render() is None
+
+    monkeypatch.setattr(chart_creator, "chart_code_sha256", lambda: "edited")
+    assert isinstance(render(), Figure)
@@ -0,0 +1,301 @@
+import numpy as np
+import pytest
+
+from monte_carlo import (
+    Asset,
+    QuantileSketch,
+    SimulationStreams,
+    StreamingFinalValueSummary,
+    StreamingWithdrawalSummary,
+    WithdrawalScenario,
+    build_path_chart_summary,
+    build_withdrawal_chart_summary,
+    calculate_withdrawal_batch,
+    calculate_withdrawal_confidence_intervals,
+    calculate_withdrawal_result_from_returns,
+    chart_percentile_bands,
+    chart_withdrawal_paths,
+    quantile_interval,
+    run_adaptive_withdrawal_monte_carlo,
+    summarise_final_values,
+    wilson_interval,
+)
+
+
+STARTING_VALUE = 10_000
+
+
+def lognormal_final_values(size, seed=1):
+    rng = np.random.default_rng(seed)
+    return STARTING_VALUE * np.exp(rng.normal(0.05, 0.2, size))
+
+
+def streaming_summary(values, chunks, exact_limit):
+    summary = StreamingFinalValueSummary(STARTING_VALUE, exact_limit=exact_limit)
+    for chunk in np.array_split(values, chunks):
+        summary.update(chunk)
+    return summary
+
+
+def withdrawal_returns_with_depletion():
+    rng = np.random.default_rng(2)
+    returns = rng.normal(0.005, 0.04, size=(40, 36))
+    # Path 0 loses most of its value early, is depleted, and must stay at zero
+    # through the strong months that follow.
+    returns[0, :3] = -0.6
+    returns[0, 3:] = 0.25
+    return returns
+
+
+@pytest.mark.parametrize(
+    "reduced_monthly_withdrawal, reduction_after_month",
+    [(None, None), (300, 12)],
+)
+def test_withdrawal_batch_matches_per_path_results(
+    reduced_monthly_withdrawal,
+    reduction_after_month,
+):
+    returns = withdrawal_returns_with_depletion()
+    scenario = WithdrawalScenario(
+        starting_value=20_000,
+        annual_withdrawal=4_800,
+        months=returns.shape[1],
+        reserve_floor=8_000,
+    )
+
+    batch = calculate_withdrawal_batch(
+        "Test",
+        returns,
+        scenario,
+        reduced_monthly_withdrawal=reduced_monthly_withdrawal,
+        reduction_after_month=reduction_after_month,
+    )
+
+    assert batch.depleted[0]
+    assert not batch.depleted.all()
+    np.testing.assert_array_equal(batch.values[0, batch.first_depletion_month[0] :], 0)
+    for index, path_returns in enumerate(returns):
+        expected = calculate_withdrawal_result_from_returns(
+            "Test",
+            path_returns.tolist(),
+            scenario,
+            reduced_monthly_withdrawal=reduced_monthly_withdrawal,
+            reduction_after_month=reduction_after_month,
+        )
+        row = batch[index]
+        np.testing.assert_array_equal(row["values"], expected["values"])
+        for key in (
+            "final_value",
+            "breached_reserve_floor",
+            "stayed_above_reserve_floor",
+            "depleted",
+            "funded_all_withdrawals",
+            "first_depletion_month",
+        ):
+            assert row[key] == expected[key], key
+
+
+@pytest.mark.parametrize("chunks", [1, 7])
+def test_streaming_summary_is_exact_below_exact_limit(chunks):
+    values = lognormal_final_values(5_000)
+
+    summary = streaming_summary(values, chunks, exact_limit=5_000)
+
+    assert summary.sketch.is_exact
+    expected = summarise_final_values(values, STARTING_VALUE)
+    result = summary.summary()
+    assert result.keys() == expected.keys()
+    for key in ("median", "loss_probability", "p5", "p95"):
+        assert result[key] == expected[key]
+    assert result["mean"] == pytest.approx(expected["mean"], rel=1e-12)
+
+
+@pytest.mark.parametrize("chunks", [1, 7, 200])
+def test_streaming_summary_quantiles_are_close_once_folded(chunks):
+    values = lognormal_final_values(200_000)
+
+    summary = streaming_summary(values, chunks, exact_limit=1_000)
+
+    assert not summary.sketch.is_exact
+    assert summary.sketch.means.size <= 2 * summary.sketch.compression
+    expected = summarise_final_values(values, STARTING_VALUE)
+    result = summary.summary()
+    for key in ("median", "p5", "p95"):
+        assert result[key] == pytest.approx(expected[key], rel=1e-3)
+    assert result["loss_probability"] == expected["loss_probability"]
+
+
+def test_sketch_quantiles_do_not_depend_on_chunking():
+    values = lognormal_final_values(50_000, seed=4)
+    one_chunk = QuantileSketch(exact_limit=1_000)
+    one_chunk.update(values)
+    many_chunks = QuantileSketch(exact_limit=1_000)
+    for chunk in np.array_split(values, 50):
+        many_chunks.update(chunk)
+
+    assert one_chunk.count == many_chunks.count
+    assert one_chunk.minimum == many_chunks.minimum
+    assert one_chunk.maximum == many_chunks.maximum
+    for quantile_value in (0.05, 0.5, 0.95):
+        assert many_chunks.quantile(quantile_value) == pytest.approx(
+            one_chunk.quantile(quantile_value),
+            rel=1e-3,
+        )
+
+
+def test_empty_sketch_has_no_quantiles():
+    with pytest.raises(ValueError, match="empty"):
+        QuantileSketch().quantile(0.5)
+
+
+ADAPTIVE_SCENARIO = WithdrawalScenario(
+    starting_value=100_000,
+    annual_withdrawal=8_000,
+    months=60,
+    reserve_floor=40_000,
+)
+
+
+def test_wilson_interval_matches_closed_form_at_zero_successes():
+    z = 1.96
+
+    low, high = wilson_interval(0, 100, z)
+
+    assert low == 0.0
+    assert high == pytest.approx(z**2 / (100 + z**2))
+
+
+def test_wilson_interval_is_symmetric_about_one_half():
+    low, high = wilson_interval(30, 200, 1.96)
+    mirrored_low, mirrored_high = wilson_interval(170, 200, 1.96)
+
+    assert low == pytest.approx(1 - mirrored_high)
+    assert high == pytest.approx(1 - mirrored_low)
+    assert low < 30 / 200 < high
+
+
+def test_quantile_interval_brackets_order_statistics():
+    values = np.arange(1_000, dtype=np.float64)
+
+    def quantile(value):
+        return values[int(value * (values.size - 1))]
+
+    low, high = quantile_interval(quantile, 0.5, values.size, 1.96)
+
+    half_width_in_ranks = 1.96 * np.sqrt(0.25 / values.size) * (values.size - 1)
+    assert low == pytest.approx(499 - half_width_in_ranks, abs=1)
+    assert high == pytest.approx(499 + half_width_in_ranks, abs=1)
+
+
+def test_confidence_intervals_cover_summary_statistics():
+    rng = np.random.default_rng(8)
+    final_values = rng.normal(100_000, 20_000, 4_000)
+    depleted = final_values < 70_000
+    final_values[depleted] = 0
+    summary = StreamingWithdrawalSummary(months=60)
+    summary.update(
+        final_values=final_values,
+        breached_reserve_floor=final_values < 80_000,
+        depleted=depleted,
+        first_depletion_month=np.where(depleted, rng.integers(1, 61, 4_000), -1),
+    )
+
+    intervals = calculate_withdrawal_confidence_intervals(summary)
+    result = summary.summary()
+
+    for key, (low, high) in intervals.items():
+        assert low <= result[key] <= high, key
+
+
+def test_adaptive_run_with_loose_tolerance_stops_after_first_batch():
+    result = run_adaptive_withdrawal_monte_carlo(
+        asset=Asset("Balanced", 0.06, 0.10),
+        scenario=ADAPTIVE_SCENARIO,
+        streams=SimulationStreams(seed=3),
+        probability_tolerance=1.0,
+        value_tolerance=10.0,
+        month_tolerance=1_000,
+        batch_size=1_000,
+        min_simulations=1_000,
+    )
+
+    assert result["converged"]
+    assert result["simulations"] == 1_000
+
+
+def test_adaptive_run_is_capped_by_max_simulations():
+    result = run_adaptive_withdrawal_monte_carlo(
+        asset=Asset("Balanced", 0.06, 0.10),
+        scenario=ADAPTIVE_SCENARIO,
+        streams=SimulationStreams(seed=3),
+        probability_tolerance=1e-6,
+        batch_size=500,
+        min_simulations=500,
+        max_simulations=1_700,
+    )
+
+    assert not result["converged"]
+    assert result["simulations"] == 1_700
+
+
+@pytest.mark.parametrize("variance_reduction", ["antithetic", "sobol", "control_variate"])
+def test_adaptive_run_needs_plain_sampling(variance_reduction):
+    with pytest.raises(ValueError, match="independent draws"):
+        run_adaptive_withdrawal_monte_carlo(
+            asset=Asset("Balanced", 0.06, 0.10),
+            scenario=ADAPTIVE_SCENARIO,
+            streams=SimulationStreams(seed=3),
+            variance_reduction=variance_reduction,
+        )
+
+
+def test_path_chart_summary_bands_match_percentiles():
+    paths = np.array(
+        [
+            [100.0, 90.0, 80.0, 60.0],
+            [100.0, 105.0, 111.0, 120.0],
+            [100.0, 101.0, 99.0, 98.0],
+            [100.0, 120.0, 150.0, 170.0],
+            [100.0, 95.0, 97.0, 104.0],
+        ]
+    )
+
+    chart_summary = build_path_chart_summary(paths, number_of_paths=2, bin_count=4)
+
+    assert chart_summary["months"] == 3
+    np.testing.assert_array_equal(chart_summary["sample_paths"], paths[:2])
+    for value in (5, 25, 50, 75, 95):
+        np.testing.assert_allclose(
+            chart_summary["bands"][f"p{value}"],
+            np.percentile(paths, value, axis=0),
+        )
+    histogram = chart_summary["final_value_histogram"]
+    assert histogram["counts"].sum() == len(paths)
+    assert histogram["edges"][[0, -1]].tolist() == [60.0, 170.0]
+    assert chart_summary["value_range"] == (60.0, 170.0)
+    assert chart_summary["path_density"] is None
+
+
+@pytest.mark.parametrize("path_style", ["lines", "density"])
+def test_withdrawal_charts_draw_from_summary(path_style):
+    returns = withdrawal_returns_with_depletion()
+    scenario = WithdrawalScenario(
+        starting_value=20_000,
+        annual_withdrawal=4_800,
+        months=returns.shape[1],
+        reserve_floor=8_000,
+    )
+    results = calculate_withdrawal_batch("Test", returns, scenario)
+
+    chart_summary = build_withdrawal_chart_summary(
+        results,
+        scenario,
+        number_of_paths=6,
+        early_months=12,
+        path_style=path_style,
+    )
+
+    assert len(chart_summary["sample_paths"]) == len(chart_summary["sample_labels"]) == 6
+    assert (chart_summary["path_density"] is None) == (path_style == "lines")
+    chart_withdrawal_paths(chart_summary, scenario, path_style=path_style)
+    chart_percentile_bands(chart_summary, scenario.starting_value)
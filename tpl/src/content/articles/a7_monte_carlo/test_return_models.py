@@ -0,0 +1,193 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from monte_carlo import Asset, WithdrawalScenario, run_withdrawal_monte_carlo
+from return_models import (
+    BlockBootstrapReturns,
+    CorrelatedPortfolioReturns,
+    GarchReturns,
+    RegimeSwitchingReturns,
+    StudentTReturns,
+)
+
+
+TUTORIALS_DIR = Path(__file__).resolve().parents[2] / "tutorials"
+T7_RETURNS = TUTORIALS_DIR / "t7_multi_fund_analysis" / "data" / "multi_fund_returns_large.csv"
+T9_DIR = TUTORIALS_DIR / "t9_portfolio_rebalancing_scenario"
+
+# The t9 WEIGHTS holdings, for tests that run without downloading prices.
+T9_WEIGHTS = {
+    "VOO": 0.20,
+    "QQQ": 0.20,
+    "IEFA": 0.20,
+    "EEM": 0.10,
+    "VNQ": 0.25,
+    "AGG": 0.05,
+}
+
+BALANCED = Asset("Balanced", 0.06, 0.10)
+
+
+def sample_model(model, simulations=20_000, months=60, seed=12):
+    returns = model.sample_returns(np.random.default_rng(seed), simulations, months)
+    assert returns.shape == (simulations, months)
+    assert np.isfinite(returns).all()
+    return returns
+
+
+# t9 imports its own top-level analytics and reporting packages, and t7 ships
+# packages with the same names.
+T9_PACKAGES = ("analytics", "reporting")
+
+
+@pytest.fixture
+def t9_main(monkeypatch, tmp_path):
+    pytest.importorskip("yfinance")
+    monkeypatch.syspath_prepend(str(T9_DIR))
+    # yfinance keeps its cache under the working directory.
+    monkeypatch.chdir(tmp_path)
+
+    # monkeypatch puts any previously imported packages back afterwards.
+    for name in list(sys.modules):
+        if name.split(".")[0] in T9_PACKAGES:
+            monkeypatch.delitem(sys.modules, name)
+
+    spec = importlib.util.spec_from_file_location("t9_main", T9_DIR / "main.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+
+    for name in list(sys.modules):
+        if name.split(".")[0] in T9_PACKAGES:
+            del sys.modules[name]
+
+
+def test_block_bootstrap_needs_fund_name_for_multi_fund_file():
+    with pytest.raises(ValueError, match="several funds"):
+        BlockBootstrapReturns.from_csv(T7_RETURNS)
+
+
+def test_block_bootstrap_blocks_are_consecutive_months_of_one_fund():
+    block_length = 6
+    model = BlockBootstrapReturns.from_csv(
+        T7_RETURNS,
+        fund_name="Fund_C",
+        block_length=block_length,
+    )
+
+    fund = pd.read_csv(T7_RETURNS, parse_dates=["date"])
+    fund = fund[fund["fund_name"] == "Fund_C"].sort_values("date")
+    np.testing.assert_array_equal(model.history, fund["fund"].to_numpy())
+
+    # The history itself is one row per calendar month, with no gaps.
+    months = fund["date"].dt.year * 12 + fund["date"].dt.month
+    assert (np.diff(months.to_numpy()) == 1).all()
+
+    samples = model.sample_returns(np.random.default_rng(3), simulations=50, months=24)
+    size = model.history.size
+    windows = model.history[
+        (np.arange(size)[:, np.newaxis] + np.arange(block_length)) % size
+    ]
+
+    # Every block is a run of consecutive months, wrapping at the end.
+    for path in samples:
+        for block in path.reshape(-1, block_length):
+            assert (windows == block).all(axis=1).any()
+
+
+def test_correlated_portfolio_from_short_return_table():
+    # Same shape as the t9 analysis window: six months of six holdings, so the
+    # sample covariance has rank 5 at most.
+    rng = np.random.default_rng(11)
+    market = rng.normal(0.01, 0.04, size=(6, 1))
+    returns = pd.DataFrame(
+        market + rng.normal(0, 0.015, size=(6, len(T9_WEIGHTS))),
+        columns=list(T9_WEIGHTS),
+    )
+    assert np.linalg.matrix_rank(returns.cov().to_numpy()) < len(T9_WEIGHTS)
+
+    model = CorrelatedPortfolioReturns.from_return_table("Current", returns, T9_WEIGHTS)
+
+    assert np.linalg.eigvalsh(model.covariance).min() > 0
+    np.testing.assert_allclose(np.diag(model.covariance), returns.var().to_numpy())
+    assert np.isfinite(model.sample_returns(rng, simulations=100, months=12)).all()
+
+
+@pytest.mark.network
+def test_correlated_portfolio_from_t9_return_table(t9_main):
+    returns = t9_main.get_return_table(t9_main.ANALYSIS_START, t9_main.ANALYSIS_END)
+
+    model = CorrelatedPortfolioReturns.from_return_table("Current", returns, t9_main.WEIGHTS)
+
+    assert np.linalg.eigvalsh(model.covariance).min() > 0
+    assert np.isfinite(
+        model.sample_returns(np.random.default_rng(5), simulations=100, months=12)
+    ).all()
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        StudentTReturns.from_asset(BALANCED),
+        GarchReturns.from_asset(BALANCED),
+        GarchReturns.from_asset(BALANCED, degrees_of_freedom=6),
+    ],
+    ids=["student_t", "garch", "garch_student_t"],
+)
+def test_model_matches_asset_moments(model):
+    returns = sample_model(model)
+
+    assert returns.mean() == pytest.approx(BALANCED.monthly_return, abs=3e-4)
+    assert returns.std() == pytest.approx(BALANCED.monthly_volatility, rel=0.03)
+
+
+def test_regime_switching_matches_stationary_moments():
+    model = RegimeSwitchingReturns("Regimes")
+    returns = sample_model(model)
+
+    probabilities = model.stationary_probabilities
+    regime_returns = np.asarray(model.regime_returns)
+    regime_variances = np.asarray(model.regime_volatilities) ** 2
+    variance = np.dot(probabilities, regime_variances + regime_returns**2)
+    variance -= model.monthly_return**2
+
+    assert probabilities.sum() == pytest.approx(1)
+    assert returns.mean() == pytest.approx(model.monthly_return, abs=3e-4)
+    assert returns.std() == pytest.approx(np.sqrt(variance), rel=0.03)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        StudentTReturns.from_asset(BALANCED),
+        GarchReturns.from_asset(BALANCED),
+        RegimeSwitchingReturns("Balanced"),
+    ],
+    ids=["student_t", "garch", "regime_switching"],
+)
+def test_model_runs_through_withdrawal_simulation(model):
+    scenario = WithdrawalScenario(
+        starting_value=100_000,
+        annual_withdrawal=8_000,
+        months=36,
+        reserve_floor=40_000,
+    )
+
+    results = run_withdrawal_monte_carlo(
+        asset=model,
+        scenario=scenario,
+        simulations=500,
+        engine="numpy",
+        rng=np.random.default_rng(4),
+    )
+
+    assert len(results) == 500
+    assert results.values.shape == (500, 37)
+    assert (results.final_value >= 0).all()
+    with pytest.raises(ValueError):
+        run_withdrawal_monte_carlo(model, scenario, 10, engine="python")
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from simulation_cache import SimulationCache
+
+
+def test_chunked_entry_is_published_when_every_row_is_written(tmp_path):
+    cache = SimulationCache(tmp_path)
+
+    def build_chunks():
+        yield np.zeros((3, 2))
+        yield np.ones((2, 2))
+
+    paths = cache.get_or_create_chunks(build_chunks, shape=(5, 2), name="full")
+
+    np.testing.assert_array_equal(paths[3:], np.ones((2, 2)))
+    assert [path.name for path in tmp_path.iterdir() if ".tmp" in path.name] == []
+
+
+@pytest.mark.parametrize("rows", [[3], [3, 3]])
+def test_chunked_entry_with_wrong_row_count_is_not_published(tmp_path, rows):
+    cache = SimulationCache(tmp_path)
+
+    def build_chunks():
+        for count in rows:
+            yield np.zeros((count, 2))
+
+    with pytest.raises(ValueError, match="rows"):
+        cache.get_or_create_chunks(build_chunks, shape=(5, 2), name="short")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_chunked_build_removes_temporary_file(tmp_path):
+    cache = SimulationCache(tmp_path)
+
+    def build_chunks():
+        yield np.zeros((2, 2))
+        raise RuntimeError("simulation failed")
+
+    with pytest.raises(RuntimeError, match="simulation failed"):
+        cache.get_or_create_chunks(build_chunks, shape=(5, 2), name="failed")
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,156 @@
+import argparse
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from chart_creator import setup_matplotlib_style
+from monte_carlo import (
+    SimulationStreams,
+    WithdrawalPolicy,
+    WithdrawalScenario,
+    build_path_chart_summary,
+    build_withdrawal_portfolios,
+    chart_percentile_bands,
+    chart_withdrawal_grid,
+    compare_withdrawal_policies,
+    print_withdrawal_grid_summary,
+    print_withdrawal_policy_comparison,
+    run_withdrawal_grid,
+)
+from simulation_cache import SimulationCache
+
+
+# Withdrawal studies that go beyond the article. They use the article's
+# withdrawal scenario and portfolios but are kept out of monte_carlo.main(),
+# so building the article does not run them or change its outputs.
+#
+#   python withdrawal_studies.py
+#   python withdrawal_studies.py --simulations 20000 --seed 11
+
+DEFAULT_OUTPUT_DIR = Path("outputs") / "studies"
+
+
+def run_withdrawal_policy_study(
+    scenario: WithdrawalScenario,
+    simulations: int,
+    streams: SimulationStreams,
+    cache: SimulationCache | None,
+    output_dir: Path,
+):
+    balanced = next(
+        portfolio
+        for portfolio in build_withdrawal_portfolios()
+        if portfolio.name == "Balanced"
+    )
+    policy_comparison = compare_withdrawal_policies(
+        asset=balanced,
+        scenario=scenario,
+        policies=[
+            WithdrawalPolicy.fixed(),
+            WithdrawalPolicy.reduced_after_month(500, 24),
+            WithdrawalPolicy.guardrails(upper_rate=0.10, lower_rate=0.06),
+            WithdrawalPolicy.percent_of_portfolio(0.08),
+        ],
+        simulations=simulations,
+        engine="numpy",
+        streams=streams,
+        cache=cache,
+        keep_paths=True,
+    )
+    print_withdrawal_policy_comparison(policy_comparison)
+
+    chart_path = output_dir / "withdrawal_bands_balanced.png"
+    fixed_results = policy_comparison["results"][0]
+    chart_percentile_bands(
+        chart_summary=build_path_chart_summary(fixed_results.values),
+        starting_value=scenario.starting_value,
+        title="Range of Balanced Portfolio Values With Fixed Withdrawals",
+        save_path=chart_path,
+    )
+    return chart_path
+
+
+def run_withdrawal_grid_study(
+    scenario: WithdrawalScenario,
+    simulations: int,
+    streams: SimulationStreams,
+    cache: SimulationCache | None,
+    output_dir: Path,
+):
+    withdrawal_grid = run_withdrawal_grid(
+        portfolios=build_withdrawal_portfolios(),
+        scenario=scenario,
+        withdrawal_rates=np.linspace(0.02, 0.12, 51),
+        reserve_floors=np.linspace(0, 80_000, 41),
+        simulations=simulations,
+        engine="numpy",
+        streams=streams,
+        cache=cache,
+    )
+    print_withdrawal_grid_summary(withdrawal_grid)
+
+    chart_path = output_dir / "withdrawal_grid_balanced.png"
+    chart_withdrawal_grid(
+        grid=withdrawal_grid,
+        portfolio_name="Balanced",
+        save_path=chart_path,
+    )
+    return chart_path
+
+
+def run_withdrawal_studies(
+    simulations: int = 5_000,
+    seed: int = 7,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    use_cache: bool = True,
+):
+    setup_matplotlib_style()
+    plt.rcParams["font.family"] = ["DejaVu Serif"]
+    streams = SimulationStreams(seed=seed)
+    cache = SimulationCache() if use_cache else None
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # The same scenario as the article's withdrawal section.
+    scenario = WithdrawalScenario(
+        starting_value=100_000,
+        annual_withdrawal=8_000,
+        months=15 * 12,
+        reserve_floor=40_000,
+    )
+    saved_chart_paths = [
+        run_withdrawal_policy_study(scenario, simulations, streams, cache, output_dir),
+        run_withdrawal_grid_study(scenario, simulations, streams, cache, output_dir),
+    ]
+
+    print("\nSaved chart files")
+    for chart_path in saved_chart_paths:
+        print(chart_path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the a7 withdrawal studies.")
+    parser.add_argument("--simulations", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Draw every simulation afresh instead of reusing cached draws.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_withdrawal_studies(
+        simulations=args.simulations,
+        seed=args.seed,
+        output_dir=args.output_dir,
+        use_cache=not args.no_cache,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,12 @@
+import os
+from functools import lru_cache
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.image as mpimg
 from cycler import cycler
 from matplotlib.offsetbox import OffsetImage, AnnotationBbox
 from matplotlib.collections import LineCollection
-from matplotlib.colors import to_rgb
+from matplotlib.colors import to_rgb, to_rgba
 
 
 COLORS = {
@@ -58,8 +60,42 @@ def setup_matplotlib_style():
     plt.rcParams["grid.linewidth"] = 0.8
 
 
+def load_logo_image(logo_path=DEFAULT_LOGO_PATH):
+    # The file's modification time is part of the cache key, so an edited logo
+    # is decoded again and unchanged logos are read once per process.
+    path = os.path.abspath(logo_path)
+    return decode_logo_image(path, os.path.getmtime(path))
+
+
+@lru_cache(maxsize=16)
+def decode_logo_image(path, modified_time):
+    # Grayscale, grayscale with alpha, RGB and RGBA files all come back as
+    # float RGBA, so every logo is drawn the same way. Alpha and zoom are left
+    # to OffsetImage. The array is shared between charts, so it is read-only.
+    image = mpimg.imread(path)
+
+    if image.dtype == np.uint8:
+        image = image.astype(np.float32) / 255
+
+    if image.ndim == 2:
+        image = image[..., np.newaxis]
+
+    if image.shape[-1] in (1, 2):
+        image = np.concatenate(
+            [np.repeat(image[..., :1], 3, axis=-1), image[..., 1:]],
+            axis=-1,
+        )
+
+    if image.shape[-1] == 3:
+        image = np.dstack([image, np.ones(image.shape[:2], dtype=image.dtype)])
+
+    image = np.ascontiguousarray(image)
+    image.setflags(write=False)
+    return image
+
+
 def add_logo_watermark(ax, logo_path=DEFAULT_LOGO_PATH, zoom=0.6, alpha=0.12):
-    image = mpimg.imread(logo_path)
+    image = load_logo_image(logo_path)
     imagebox = OffsetImage(image, zoom=zoom, alpha=alpha)
 
     ab = AnnotationBbox(
@@ -125,11 +161,42 @@ def build_line_segments(x, y):
     """
     Build matplotlib line segments from x/y data.
     """
-    x = np.asarray(x, dtype=float)
-    y = np.asarray(y, dtype=float)
+    points = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    return np.stack([points[:-1], points[1:]], axis=1)
+
+
+def decimate_gradient_line(x, y, segment_colors, max_segments):
+    """
+    Reduce a long gradient line to roughly max_segments segments.
+
+    Points are grouped into consecutive bins. Each bin keeps its first,
+    lowest and highest points in order, so peaks and troughs survive at
+    screen resolution. Each kept segment takes the mean colour of the
+    original segments it replaces.
+    """
+    n_points = len(y)
+    bin_size = int(np.ceil(n_points / max(max_segments // 3, 1)))
+    n_bins = int(np.ceil(n_points / bin_size))
+
+    padded = np.full(n_bins * bin_size, np.nan)
+    padded[:n_points] = y
+    padded = padded.reshape(n_bins, bin_size)
+
+    starts = np.arange(n_bins) * bin_size
+    kept = np.concatenate(
+        [
+            starts,
+            starts + np.nanargmin(padded, axis=1),
+            starts + np.nanargmax(padded, axis=1),
+            [n_points - 1],
+        ]
+    )
+    kept = np.unique(kept)
 
-    points = np.array([x, y]).T.reshape(-1, 1, 2)
-    return np.concatenate([points[:-1], points[1:]], axis=1)
+    colour_sums = np.add.reduceat(segment_colors, kept[:-1], axis=0)
+    kept_colors = colour_sums / np.diff(kept)[:, np.newaxis]
+
+    return x[kept], y[kept], kept_colors
 
 
 def normalise_range(values, sensitivity=0.75):
@@ -156,44 +223,56 @@ def normalise_range(values, sensitivity=0.75):
 def blend_rgb(color_a, color_b, weight_a=0.5):
     """
     Blend two matplotlib-compatible colours in RGB space.
+
+    weight_a may be a single weight or an array of weights, giving an
+    array of colours with a trailing RGB axis.
     """
     a = np.array(to_rgb(color_a))
     b = np.array(to_rgb(color_b))
-    weight_b = 1.0 - weight_a
-    return weight_a * a + weight_b * b
+    weight_a = np.asarray(weight_a, dtype=float)[..., np.newaxis]
+    return b + weight_a * (a - b)
+
+
+def rgb_to_rgba(rgb, alpha=1.0):
+    """
+    Add an alpha channel to an array of RGB colours.
+    """
+    rgb = np.asarray(rgb, dtype=float)
+    alpha_channel = np.full(rgb.shape[:-1] + (1,), alpha)
+    return np.concatenate([rgb, alpha_channel], axis=-1)
 
 
 def get_bar_colors(values, positive_color=None, negative_color=None):
     """
-    Return per-bar colours based on sign.
+    Return an (N, 4) RGBA array of per-bar colours based on sign.
     """
     positive_color = positive_color or COLORS["accent"]
     negative_color = negative_color or COLORS["negative"]
 
-    return [
-        positive_color if value >= 0 else negative_color
-        for value in values
-    ]
+    values = np.asarray(values, dtype=float)
+    return np.where(
+        (values >= 0)[:, np.newaxis],
+        to_rgba(positive_color),
+        to_rgba(negative_color),
+    )
 
 
 def get_line_gradient_colors(values, sensitivity=0.75):
     """
-    Create explicit blended colours for a line, mapped from:
+    Create explicit blended colours for a line as an (N, 4) RGBA array,
+    mapped from:
     lowest value -> red
     highest value -> green
     """
     scaled = normalise_range(values, sensitivity=sensitivity)
 
-    colors = []
-    for w in scaled:
-        color = blend_rgb(
+    return rgb_to_rgba(
+        blend_rgb(
             COLORS["negative"],
             COLORS["accent"],
-            weight_a=1.0 - w,
+            weight_a=1.0 - scaled,
         )
-        colors.append(color)
-
-    return colors
+    )
 
 
 def add_gradient_line(
@@ -205,12 +284,17 @@ def add_gradient_line(
     linewidth=3.2,
     alpha=1.0,
     zorder=3,
+    max_segments=10_000,
 ):
     """
     Add a line with explicit blended segment colours.
 
     Lowest observed value -> red
     Highest observed value -> green
+
+    Lines with more than max_segments segments are decimated before
+    drawing, since matplotlib builds one path per segment. The default is
+    well above the pixel width of a saved chart.
     """
     x = np.asarray(x, dtype=float)
     y = np.asarray(y, dtype=float)
@@ -219,7 +303,6 @@ def add_gradient_line(
         ax.plot(x, y, color=COLORS["accent"], linewidth=linewidth, alpha=alpha, zorder=zorder)
         return
 
-    segments = build_line_segments(x, y)
     segment_values = get_line_segment_values(y, color_values=color_values)
 
     if np.isclose(np.min(segment_values), np.max(segment_values)):
@@ -227,6 +310,17 @@ def add_gradient_line(
         return
 
     segment_colors = get_line_gradient_colors(segment_values, sensitivity=sensitivity)
+    line_x, line_y = x, y
+
+    if max_segments is not None and len(segment_colors) > max_segments:
+        line_x, line_y, segment_colors = decimate_gradient_line(
+            x,
+            y,
+            segment_colors,
+            max_segments,
+        )
+
+    segments = build_line_segments(line_x, line_y)
 
     lc = LineCollection(
         segments,
@@ -250,7 +344,7 @@ def get_bivariate_scatter_colors(
     y_sensitivity=0.75,
 ):
     """
-    Create bivariate colours for scatter points.
+    Create bivariate colours for scatter points as an (N, 4) RGBA array.
 
     y-axis:
         low return -> red
@@ -266,24 +360,19 @@ def get_bivariate_scatter_colors(
     x_norm = normalise_range(x_values, sensitivity=x_sensitivity)
     y_norm = normalise_range(y_values, sensitivity=y_sensitivity)
 
-    colors = []
-    for xw, yw in zip(x_norm, y_norm):
-        return_color = blend_rgb(
-            COLORS["negative"],
-            COLORS["accent"],
-            weight_a=1.0 - yw,
-        )
-
-        risk_color = blend_rgb(
-            COLORS["muted_fg"],
-            COLORS["link"],
-            weight_a=1.0 - xw,
-        )
+    return_colors = blend_rgb(
+        COLORS["negative"],
+        COLORS["accent"],
+        weight_a=1.0 - y_norm,
+    )
 
-        final_color = 0.68 * return_color + 0.32 * risk_color
-        colors.append(final_color)
+    risk_colors = blend_rgb(
+        COLORS["muted_fg"],
+        COLORS["link"],
+        weight_a=1.0 - x_norm,
+    )
 
-    return colors
+    return rgb_to_rgba(0.68 * return_colors + 0.32 * risk_colors)
 
 
 def line_chart(